@@ -1,50 +1,31 @@
 # SubplaceJoiner_Qt.py (patched v2)
 # PySide6 UI + join flow fixes + persistence fixes
 
-import time
-import sys, os, json, uuid, threading, platform, webbrowser, subprocess, base64, re, stat
+import time; _T0 = time.perf_counter()
+import re, sys, threading, webbrowser
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timezone
-from pathlib import Path
-from io import BytesIO
-
-# --- ensure Requests ignores system proxies to avoid hangs ---
-
-import requests
-import asyncio
-from PIL import Image, ImageDraw
-try:
-    from PIL.ImageQt import ImageQt
-except Exception:
-    ImageQt = None
-
-# Optional deps used opportunistically
-try:
-    import psutil
-except Exception:
-    psutil = None
-
-try:
-    from mitmproxy import http  # type: ignore
-    from mitmproxy.options import Options  # type: ignore
-    from mitmproxy.tools.dump import DumpMaster  # type: ignore
-    MITM_AVAILABLE = True
-except Exception:
-    MITM_AVAILABLE = False
-
-try:
-    import win32crypt  # type: ignore
-except Exception:
-    win32crypt = None
-
-from PySide6.QtCore import Qt, QSize, QEvent, QTimer, QRectF, Signal, QObject
+
+from hopr_core import (
+    DATA_DIR, IMPORT_TIMES, TimestampLoader, ThumbDiskCache, ThumbnailPipeline, HoprEngine, SettingsStore,
+    SearchJobs, SearchCancelled, Prefetcher, proxy_available, preload_optional, logger, setup_logging,
+)
+_log_ui = logger("ui"); _log_search = logger("search"); _log_thumb = logger("thumb"); _log_http = logger("http"); _log_join = logger("join")
+_T_CORE = time.perf_counter()
+
+from PySide6.QtCore import Qt, QSize, QEvent, QTimer, QRect, QRectF, Signal, QObject
 from PySide6.QtGui import QFont, QPalette, QColor, QFontMetrics, QPainter, QPixmap, QImage
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
-    QHBoxLayout, QVBoxLayout, QGridLayout, QScrollArea, QSplitter, QCheckBox,
+    QHBoxLayout, QVBoxLayout, QLayout, QScrollArea, QSplitter, QCheckBox,
     QFrame, QSizePolicy, QGraphicsDropShadowEffect, QMenu,
-    QColorDialog, QSlider, QWidgetAction, QSplitterHandle
+    QColorDialog, QFileDialog, QSlider, QWidgetAction, QSplitterHandle
 )
 
+# Startup phase timings in seconds, reported by `python Hopr.py --profile-startup`
+STARTUP = {"import hopr_core": _T_CORE - _T0, "import PySide6": time.perf_counter() - _T_CORE}
+
 # ==================== Theming helpers ====================
 
 def _safe_set_dpi_policy():
@@ -257,61 +238,129 @@ class Chip(QPushButton):
         max_text = max(10, self._chip_width - padding)
         f = self.font(); f.setPointSizeF(self._base_pt)
         fm = QFontMetrics(f)
+        if getattr(self, "_base_adv", None) is None:
+            self._base_adv = fm.horizontalAdvance(self.text())
+        if self._base_adv <= max_text:
+            # Common case: label fits at the base size, so only touch the font if it was shrunk before
+            if getattr(self, "_fitted_pt", None) != self._base_pt:
+                self.setFont(f); self._fitted_pt = self._base_pt
+            return
         while fm.horizontalAdvance(self.text()) > max_text and f.pointSizeF() > self._min_pt:
             f.setPointSizeF(f.pointSizeF() - 0.5); fm = QFontMetrics(f)
-        self.setFont(f)
+        if f.pointSizeF() != getattr(self, "_fitted_pt", None):
+            self.setFont(f); self._fitted_pt = f.pointSizeF()
     def setChipWidth(self, w):
+        if int(w) == self._chip_width and self.width() == self._chip_width:
+            return
         self._chip_width = int(w); self.setFixedWidth(self._chip_width); self._fit_text()
 
 class Search(QLineEdit):
     def __init__(self, ph):
         super().__init__(); self.setObjectName("Search"); self.setPlaceholderText(ph); self.setMinimumHeight(36)
 
+class FlowLayout(QLayout):
+    """Uniform-width flow for chips: every item gets the same stretched width, laid out row-major.
+
+    Geometry is only pushed to the items when the column count, item width, origin or item
+    list changes, and at most once per frame however many resizes arrive in between.
+    """
+    def __init__(self, parent=None, hspacing=8, vspacing=8, min_width=90, max_width=240, target_width=110):
+        super().__init__(parent)
+        self._items = []; self._applied = None; self._rect = QRect()
+        self._timer = QTimer(self); self._timer.setSingleShot(True); self._timer.setInterval(16)
+        self._timer.timeout.connect(self._apply)
+        self.hspacing = int(hspacing); self.vspacing = int(vspacing)
+        self.min_width = int(min_width); self.max_width = int(max_width); self.target_width = int(target_width)
+    def addItem(self, item):
+        self._items.append(item); self._applied = None
+    def count(self):
+        return len(self._items)
+    def itemAt(self, i):
+        return self._items[i] if 0 <= i < len(self._items) else None
+    def takeAt(self, i):
+        if 0 <= i < len(self._items):
+            self._applied = None; return self._items.pop(i)
+        return None
+    def relayout(self):
+        """Force the next pass to re-push geometry (item list or sizing parameters changed)."""
+        self._applied = None; self.invalidate()
+    def expandingDirections(self):
+        return Qt.Orientation(0)
+    def hasHeightForWidth(self):
+        return True
+    def heightForWidth(self, width):
+        cols, _ = self._columns(width)
+        rows = -(-len(self._items) // cols)
+        l, t, r, b = self.getContentsMargins()
+        return t + b + rows * self._item_height() + max(0, rows - 1) * self.vspacing
+    def sizeHint(self):
+        w = max(self.geometry().width(), self.minimumSize().width())
+        return QSize(w, self.heightForWidth(w))
+    def minimumSize(self):
+        l, t, r, b = self.getContentsMargins()
+        return QSize(self.min_width + l + r, t + b + (self._item_height() if self._items else 0))
+    def setGeometry(self, rect):
+        super().setGeometry(rect)
+        self._rect = QRect(rect)
+        if self._applied is None:
+            self._apply()  # first pass / after invalidate: no reason to wait
+        elif not self._timer.isActive():
+            self._timer.start()
+    def _apply(self):
+        self._timer.stop(); rect = self._rect
+        cols, item_w = self._columns(rect.width())
+        key = (cols, item_w, rect.x(), rect.y(), len(self._items))
+        if key == self._applied:
+            return
+        self._applied = key
+        l, t, r, b = self.getContentsMargins(); ih = self._item_height()
+        for idx, item in enumerate(self._items):
+            w = item.widget()
+            if w is not None and hasattr(w, "setChipWidth") and w.width() != item_w:
+                w.setChipWidth(item_w)
+            row, col = divmod(idx, cols)
+            item.setGeometry(QRect(rect.x() + l + col * (item_w + self.hspacing),
+                                   rect.y() + t + row * (ih + self.vspacing), item_w, ih))
+    def _columns(self, width):
+        l, t, r, b = self.getContentsMargins()
+        avail = max(1, width - l - r)
+        tw = max(self.min_width, self.target_width)
+        cols = max(1, (avail + self.hspacing) // (tw + self.hspacing))
+        stretched = (avail - (cols - 1) * self.hspacing) // cols
+        return cols, max(self.min_width, min(self.max_width, stretched))
+    def _item_height(self):
+        return self._items[0].sizeHint().height() if self._items else 0
+
 class ChipFlow(QWidget):
     def __init__(self, labels, parent=None, chip_width=110, hspacing=8, vspacing=8,
                  margins=(10,8,10,10), min_width=90, max_width=240, target_width=110):
         super().__init__(parent)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        self.grid = QGridLayout(self); self.grid.setContentsMargins(*margins)
-        self.grid.setHorizontalSpacing(hspacing); self.grid.setVerticalSpacing(vspacing)
-        self.grid.setAlignment(Qt.AlignLeft | Qt.AlignTop)
-        self.min_width=int(min_width); self.max_width=int(max_width); self.target_width=int(target_width)
+        self.flow = FlowLayout(self, hspacing, vspacing, min_width, max_width, target_width)
+        self.flow.setContentsMargins(*margins)
         self.chips = []
         self.set_labels(labels, chip_width)
-        QTimer.singleShot(0, self.reflow)
+    @property
+    def min_width(self): return self.flow.min_width
+    @property
+    def max_width(self): return self.flow.max_width
+    @property
+    def target_width(self): return self.flow.target_width
     def set_labels(self, labels, chip_width=110):
         # clear
         for c in self.chips:
-            c.setParent(None)
+            self.flow.removeWidget(c); c.setParent(None)
         self.chips = [Chip(str(s), width=chip_width) for s in labels]
         for c in self.chips:
-            self.grid.addWidget(c, 0, 0)
+            self.flow.addWidget(c)
         self.reflow()
     def setTargetWidth(self, w:int):
-        self.target_width=max(48,int(w)); self.reflow()
+        self.flow.target_width=max(48,int(w)); self.reflow()
     def setMinMaxWidth(self, min_w:int, max_w:int):
-        self.min_width=int(min_w); self.max_width=int(max_w); self.reflow()
-    def _inner_width(self):
-        return max(1, self.contentsRect().width())
-    def resizeEvent(self, e):
-        super().resizeEvent(e); self.reflow()
+        self.flow.min_width=int(min_w); self.flow.max_width=int(max_w); self.reflow()
     def reflow(self):
-        if not self.chips: return
-        l,t,r,b = self.grid.getContentsMargins()
-        avail = max(1, self._inner_width() - l - r)
-        spacing = self.grid.horizontalSpacing()
-        tw = max(self.min_width, self.target_width)
-        cols = max(1, (avail + spacing) // (tw + spacing))
-        stretched = (avail - (cols - 1) * spacing) // cols
-        chip_w = max(self.min_width, min(self.max_width, stretched))
-        while self.grid.count():
-            it = self.grid.takeAt(0); w = it.widget();
-            if w is not None: w.setParent(self)
-        for idx, w in enumerate(self.chips):
-            w.setChipWidth(chip_w)
-            self.grid.addWidget(w, idx // cols, idx % cols)
-        for c in range(cols):
-            self.grid.setColumnStretch(c, 0)
+        # Schedules a single layout pass; repeated calls before it runs are free
+        self.flow.relayout(); self.updateGeometry()
 
 class FlowScroll(QScrollArea):
     def __init__(self, flow: ChipFlow):
@@ -320,9 +369,65 @@ class FlowScroll(QScrollArea):
         self._flow = flow; self.setWidget(self._flow); self.viewport().installEventFilter(self)
     def eventFilter(self, obj, event):
         if obj is self.viewport() and event.type() == QEvent.Resize:
-            self._flow.setMinimumWidth(self.viewport().width()); self._flow.setMaximumWidth(self.viewport().width()); self._flow.reflow()
+            self._flow.setFixedWidth(self.viewport().width())
         return super().eventFilter(obj, event)
 
+# ---------------- Thumbnail pixmap cache ----------------
+class PixmapCache:
+    """Display-ready QPixmaps keyed by (place_id, size bucket), evicted LRU past `budget` bytes.
+
+    Each place also keeps one source QImage (downscaled to `source_px`) so a new bucket can be
+    produced without touching disk; sources count against the same budget.
+    """
+    BUCKET = 16
+    def __init__(self, budget=48 * 1024 * 1024, source_px=256):
+        self.budget = int(budget); self.source_px = int(source_px)
+        self._items = OrderedDict(); self._bytes = 0
+    @classmethod
+    def bucket(cls, side) -> int:
+        return max(cls.BUCKET, -(-int(side) // cls.BUCKET) * cls.BUCKET)
+    def has_source(self, place_id) -> bool:
+        return (place_id, 0) in self._items
+    def put_source(self, place_id, qimg: QImage):
+        if qimg.width() > self.source_px or qimg.height() > self.source_px:
+            qimg = qimg.scaled(self.source_px, self.source_px, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Drop stale buckets rendered from a previous source
+        for key in [k for k in self._items if k[0] == place_id]:
+            self._drop(key)
+        self._store((place_id, 0), qimg)
+    def get(self, place_id, side) -> QPixmap|None:
+        b = self.bucket(side); key = (place_id, b)
+        pix = self._items.get(key)
+        if pix is not None:
+            self._items.move_to_end(key); return pix
+        src = self._items.get((place_id, 0))
+        if src is None:
+            return None
+        self._items.move_to_end((place_id, 0))
+        pix = QPixmap.fromImage(src.scaled(b, b, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self._store(key, pix)
+        return pix
+    def set_budget(self, budget):
+        self.budget = int(budget); self._evict()
+    def footprint(self):
+        """(bytes, entries) currently held."""
+        return self._bytes, len(self._items)
+    @staticmethod
+    def _cost(obj):
+        return obj.width() * obj.height() * 4
+    def _store(self, key, obj):
+        self._items[key] = obj; self._bytes += self._cost(obj); self._evict(keep=key)
+    def _drop(self, key):
+        obj = self._items.pop(key, None)
+        if obj is not None:
+            self._bytes -= self._cost(obj)
+    def _evict(self, keep=None):
+        for key in list(self._items):
+            if self._bytes <= self.budget:
+                break
+            if key != keep:
+                self._drop(key)
+
 # ---------------- PlaceCard with callbacks & async thumbnail ----------------
 
 
@@ -334,9 +439,30 @@ class PlaceCard(QFrame):
         super().__init__(); self.setObjectName("PlaceCard")
         self._shadow = make_shadow(20,0,6,QColor(0,0,0,140)); self.setGraphicsEffect(self._shadow)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self._thumb_base = thumb_base
+        self._thumb_base = thumb_base; self.thumb_side = thumb_base[1]; self.thumb_bucket = None
+        lay = QVBoxLayout(self); lay.setContentsMargins(12,12,12,12); lay.setSpacing(10)
+        self.thumb = QLabel("(thumbnail)"); self.thumb.setObjectName("Thumb")
+        self.thumb.setMinimumSize(*thumb_base); self.thumb.setAlignment(Qt.AlignCenter)
+        self.title_lbl = QLabel(); self.title_lbl.setWordWrap(True)
+        f=QFont(); f.setPointSize(12); f.setBold(True); self.title_lbl.setFont(f)
+        # Two lines reserved so every card (and therefore every grid row) has the same height
+        self.title_lbl.setFixedHeight(QFontMetrics(f).lineSpacing() * 2)
+        self.title_lbl.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.join_btn = AccentButton("Join"); open_btn = GhostButton("Open 🌐")
+        self.join_btn.setFixedHeight(34); open_btn.setFixedHeight(34)
+        self.join_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        open_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        row = QHBoxLayout(); row.setSpacing(8); row.addWidget(self.join_btn); row.addWidget(open_btn)
+        self.meta_lbl = QLabel()
+        lay.addWidget(self.thumb); lay.addWidget(self.title_lbl); lay.addWidget(self.meta_lbl); lay.addLayout(row)
+        self.bind(place)
+        self._update_fixed_height()
+        # wiring (reads self.place at click time, so recycled cards join the place they show)
+        self.join_btn.clicked.connect(lambda: on_join(self.place.get('id')))
+        open_btn.clicked.connect(lambda: on_open(self.place.get('id')))
+    def bind(self, place):
         # normalize place dict and id keys (some APIs return 'id' or 'placeId')
-        self.place = place or {}
+        self.place = place if place is not None else {}
         pid = self.place.get('id') or self.place.get('placeId') or self.place.get('place_id') or self.place.get('place')
         if pid is not None:
             try:
@@ -344,31 +470,21 @@ class PlaceCard(QFrame):
             except Exception:
                 pass
         self.place['id'] = pid
-        lay = QVBoxLayout(self); lay.setContentsMargins(12,12,12,12); lay.setSpacing(10)
-        self.thumb = QLabel("(thumbnail)"); self.thumb.setObjectName("Thumb")
-        self.thumb.setMinimumSize(*thumb_base); self.thumb.setAlignment(Qt.AlignCenter)
         title = f"{self.place.get('name','Unknown')} (ID: {self.place.get('id','?')})"
         if self.place.get('is_root'):
             title += "  ⭐ ROOT"
-        self.title_lbl = QLabel(title); self.title_lbl.setWordWrap(True)
-        f=QFont(); f.setPointSize(12); f.setBold(True); self.title_lbl.setFont(f)
-        join_btn = AccentButton("Join"); open_btn = GhostButton("Open 🌐")
-        join_btn.setFixedHeight(34); open_btn.setFixedHeight(34)
-        join_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        open_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        row = QHBoxLayout(); row.setSpacing(8); row.addWidget(join_btn); row.addWidget(open_btn)
+        self.title_lbl.setText(title); self.title_lbl.setToolTip(title)
+        self.thumb.clear(); self.thumb.setText("(thumbnail)"); self.thumb_bucket = None
+        self.refresh_meta()
+    def refresh_meta(self):
         created_ago = self.time_ago(self.place.get('created'))
         updated_ago = self.time_ago(self.place.get('updated'))
-        meta = QLabel(f"Created: {created_ago}\nUpdated: {updated_ago}")
-        lay.addWidget(self.thumb); lay.addWidget(self.title_lbl); lay.addWidget(meta); lay.addLayout(row)
-        self._update_fixed_height()
-        # wiring
-        join_btn.clicked.connect(lambda: on_join(self.place.get('id')))
-        open_btn.clicked.connect(lambda: on_open(self.place.get('id')))
+        self.meta_lbl.setText(f"Created: {created_ago}\nUpdated: {updated_ago}")
     def _update_fixed_height(self):
         self.adjustSize(); h = self.sizeHint().height(); self.setMaximumHeight(h)
     def set_thumb_scale(self, scale: float):
         w = max(140, int(self._thumb_base[0] * scale)); h = max(84, int(self._thumb_base[1] * scale))
+        self.thumb_side = h
         self.thumb.setMinimumSize(w, h); self.thumb.setMaximumHeight(h + 4); self._update_fixed_height()
     def time_ago(self, iso_time: str):
         """Convert ISO timestamp (e.g. '2025-09-30T12:35:16.34Z') into 'x days ago'."""
@@ -401,6 +517,146 @@ class PlaceCard(QFrame):
         except Exception:
             return iso_time
 
+# ---------------- virtualized results grid ----------------
+class ResultsGrid(QWidget):
+    """Results area that only materializes PlaceCards for rows in or near the viewport.
+
+    Cards are kept in a pool and re-bound to whichever places scroll into view; the host is
+    sized to the full grid so the scroll area behaves as if every card existed.
+    `on_bound(cards)` fires with freshly bound cards so thumbnails load by visibility.
+    `append_section(title, places)` starts a titled group (one header row, then its own card rows);
+    plain `set_places`/`append_places` results have no headers.
+    """
+    MARGIN = 8; SPACING = 12; OVERSCAN = 1  # rows kept alive above/below the viewport
+    def __init__(self, scroll: QScrollArea, make_card, on_bound=None):
+        super().__init__()
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._scroll = scroll; self._make_card = make_card; self._on_bound = on_bound
+        self.places = []; self.card_width = 300; self.scale = 1.0; self.join_enabled = True
+        self._live = {}; self._by_id = {}; self._pool = []; self._cols = 1; self._row_h = 0; self._proto = None; self._geom = None
+        # Sections: (start index, header label); _layout holds (start, end, y of first card row) per section
+        self._sections = []; self._starts = [0]; self._layout = [(0, 0, self.MARGIN)]
+        # Resize storms (window drag, splitter drag) collapse into at most one relayout per frame
+        self._relayout_timer = QTimer(self); self._relayout_timer.setSingleShot(True); self._relayout_timer.setInterval(16)
+        self._relayout_timer.timeout.connect(self.relayout)
+        scroll.verticalScrollBar().valueChanged.connect(lambda _: self.update_visible())
+        # Once the grid is taller than the viewport, a taller viewport doesn't resize the grid itself
+        scroll.viewport().installEventFilter(self)
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.Resize and obj is self._scroll.viewport():
+            self.update_visible()
+        return super().eventFilter(obj, e)
+    def cards(self):
+        return list(self._live.values())
+    def card_for(self, place_id):
+        """The live card showing `place_id`, or None if it is off-screen (O(1))."""
+        return self._by_id.get(place_id)
+    def set_places(self, places):
+        for card in self._live.values():
+            self._recycle(card)
+        for _, header in self._sections:
+            header.hide(); header.deleteLater()
+        self._live = {}; self._by_id = {}; self._sections = []; self.places = list(places)
+        self._scroll.verticalScrollBar().setValue(0); self.relayout()
+    def append_places(self, places):
+        self.places.extend(places); self.relayout()
+    def append_section(self, title, places):
+        header = QLabel(title, self); header.setObjectName("CardTitle"); header.setTextFormat(Qt.PlainText)
+        f = QFont(); f.setBold(True); header.setFont(f); header.show()
+        self._sections.append((len(self.places), header)); self.append_places(places)
+    def remove_places(self, place_ids):
+        drop = set(place_ids)
+        # Indices shift, so every live card is re-bound on the next visibility pass
+        for card in self._live.values():
+            self._recycle(card)
+        ends = [start for start, _ in self._sections[1:]] + [len(self.places)]
+        kept = [[p for p in self.places[start:end] if p.get('id') not in drop] for (start, _), end in zip(self._sections, ends)]
+        self._sections = [(sum(map(len, kept[:k])), header) for k, (_, header) in enumerate(self._sections)]
+        self._live = {}; self._by_id = {}; self.places = [p for p in self.places if p.get('id') not in drop]
+        self.relayout()
+    def set_card_width(self, w):
+        self.card_width = int(w); self.relayout()
+    def set_scale(self, scale: float):
+        self.scale = scale
+        for card in list(self._live.values()) + self._pool:
+            card.set_thumb_scale(scale)
+        self._row_h = 0; self.relayout()
+    def set_join_enabled(self, enable: bool):
+        self.join_enabled = enable
+        for card in self._live.values():
+            card.join_btn.setEnabled(enable)
+    def row_height(self):
+        if not self._row_h:
+            if self._proto is None:
+                self._proto = self._new_card(); self._proto.hide()
+            self._proto.set_thumb_scale(self.scale); self._row_h = self._proto.sizeHint().height()
+        return self._row_h
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        if not self._relayout_timer.isActive():
+            self._relayout_timer.start()
+    def relayout(self):
+        self._relayout_timer.stop()
+        self._cols = max(1, self.width() // self.card_width)
+        geom = (self._cols, self.width(), self.row_height(), len(self.places), tuple(start for start, _ in self._sections))
+        if geom != self._geom:
+            # Only live (visible) cards and the section headers are repositioned; nothing is torn down or re-added
+            self._geom = geom; pitch = self.row_height() + self.SPACING
+            starts = [start for start, _ in self._sections] or [0]
+            y = self.MARGIN; self._layout = []
+            for k, start in enumerate(starts):
+                end = starts[k + 1] if k + 1 < len(starts) else len(self.places)
+                if self._sections:
+                    header = self._sections[k][1]; hh = header.sizeHint().height()
+                    header.setGeometry(self.MARGIN, y, max(1, self.width() - 2 * self.MARGIN), hh); y += hh + self.SPACING
+                self._layout.append((start, end, y)); y += -(-(end - start) // self._cols) * pitch
+            self._starts = starts
+            self.setMinimumHeight(y - self.SPACING + self.MARGIN if self.places or self._sections else 0)
+            for i, card in self._live.items():
+                card.setGeometry(self._cell(i))
+        self.update_visible()
+    def _cell(self, i):
+        cols = self._cols; sp = self.SPACING
+        w = max(1, (self.width() - 2 * self.MARGIN - (cols - 1) * sp) // cols)
+        start, _, y = self._layout[bisect_right(self._starts, i) - 1]
+        r, c = divmod(i - start, cols)
+        return QRect(self.MARGIN + c * (w + sp), y + r * (self.row_height() + sp), w, self.row_height())
+    def update_visible(self):
+        top = self._scroll.verticalScrollBar().value(); bottom = top + self._scroll.viewport().height()
+        pitch = self.row_height() + self.SPACING; spans = []
+        for start, end, y in self._layout:
+            if end <= start or y > bottom + self.OVERSCAN * pitch:
+                continue
+            first = max(0, (top - y) // pitch - self.OVERSCAN); last = max(0, (bottom - y) // pitch + self.OVERSCAN)
+            lo = start + first * self._cols; hi = min(end, start + (last + 1) * self._cols)
+            if lo < hi:
+                spans.append((lo, hi))
+        keep = {i for lo, hi in spans for i in range(lo, hi)}
+        for i in [i for i in self._live if i not in keep]:
+            card = self._live.pop(i); self._recycle(card)
+            if self._by_id.get(card.place.get('id')) is card:
+                del self._by_id[card.place.get('id')]
+        bound = []
+        for i in sorted(keep):
+            if i in self._live:
+                continue
+            card = self._pool.pop() if self._pool else self._new_card()
+            card.bind(self.places[i]); card.join_btn.setEnabled(self.join_enabled)
+            card.setGeometry(self._cell(i)); card.show()
+            self._live[i] = card; self._by_id[card.place.get('id')] = card; bound.append(card)
+        if bound and self._on_bound:
+            self._on_bound(bound)
+    def _new_card(self):
+        card = self._make_card({}); card.setParent(self); card.set_thumb_scale(self.scale)
+        return card
+    def _recycle(self, card):
+        # Hiding the focus widget makes QScrollArea scroll to whatever takes focus next, which would
+        # snap the view back mid-scroll (and re-enter update_visible); drop focus first
+        fw = QApplication.focusWidget()
+        if fw is not None and (fw is card or card.isAncestorOf(fw)):
+            fw.clearFocus()
+        card.hide(); self._pool.append(card)
+
 # -------- collapsible hero --------
 class CollapsibleHero(Card):
     def __init__(self, on_theme, on_text_color, on_btn_color, on_grid_size,
@@ -439,66 +695,134 @@ class CollapsibleHero(Card):
 
 # ==================== Main Window ====================
 from PySide6.QtCore import QObject, Signal, Qt, QTimer
-class _MainThreadInvoker(QObject):
-    call = Signal(object)
-    def __init__(self, parent=None):
+class _UiDispatcher(QObject):
+    """Applies worker-thread updates on the UI thread in batches, at most once per frame (~60 Hz).
+
+    `post(fn)` queues a callable; `post_item(kind, item, apply)` collects items and calls `apply(items)`
+    in chunks, so a burst of thumbnails or timestamp batches costs a few passes over the cards. A flush
+    stops after `budget_ms` and leaves the rest for the next frame. Queue depth and flush cost are kept
+    in `stats` (see summary()).
+    """
+    wake = Signal()
+    def __init__(self, parent=None, interval_ms=16, budget_ms=8, chunk=16):
         super().__init__(parent)
-        self.call.connect(self._run, Qt.QueuedConnection)
-    def _run(self, fn):
-        try:
-            print('[DEBUG] _invoker: executing UI callback...')
-            fn()
-            print('[DEBUG] _invoker: UI callback complete')
-        except Exception as e:
-            import traceback
-            print('[DEBUG] Exception in main-thread invoker:', e)
-            traceback.print_exc()
+        self.interval = interval_ms / 1000.0; self.budget = budget_ms / 1000.0; self.chunk = chunk
+        self._lock = threading.Lock(); self._queue = []; self._batches = {}; self._armed = False; self._last = 0.0
+        self._timer = QTimer(self); self._timer.setSingleShot(True); self._timer.timeout.connect(self._flush)
+        self.wake.connect(self._schedule, Qt.QueuedConnection)
+        self.stats = {"posts": 0, "flushes": 0, "max_depth": 0, "deferred": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+    def post(self, fn):
+        with self._lock:
+            self._queue.append(fn); self.stats["posts"] += 1
+            wake = not self._armed; self._armed = True
+        if wake: self.wake.emit()
+
+    def post_item(self, kind, item, apply):
+        with self._lock:
+            batch = self._batches.get(kind)
+            if batch is None:
+                batch = self._batches[kind] = [kind, apply, []]
+                self._queue.append(batch)  # keeps its place in FIFO order relative to plain posts
+            batch[2].append(item)
+            self.stats["posts"] += 1; wake = not self._armed; self._armed = True
+        if wake: self.wake.emit()
+
+    def depth(self):
+        with self._lock:
+            return sum(len(e[2]) if isinstance(e, list) else 1 for e in self._queue)
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            delay = self._last + self.interval - time.perf_counter()
+            self._timer.start(max(0, int(delay * 1000)))
+
+    def _flush(self):
+        with self._lock:
+            queue, self._queue = self._queue, []; self._batches = {}; self._armed = False
+        t0 = time.perf_counter(); self._last = t0; deadline = t0 + self.budget
+        depth = sum(len(e[2]) if isinstance(e, list) else 1 for e in queue)
+        i = 0
+        while i < len(queue):
+            entry = queue[i]
+            try:
+                if isinstance(entry, list):
+                    chunk, entry[2] = entry[2][:self.chunk], entry[2][self.chunk:]
+                    entry[1](chunk)
+                    if not entry[2]: i += 1
+                else:
+                    i += 1; entry()
+            except Exception:
+                _log_ui.exception("exception in UI dispatcher")
+            if i < len(queue) and time.perf_counter() > deadline:
+                break
+        if i < len(queue):
+            self._requeue(queue[i:])
+        ms = (time.perf_counter() - t0) * 1000; st = self.stats
+        st["flushes"] += 1; st["total_ms"] += ms; st["max_ms"] = max(st["max_ms"], ms); st["max_depth"] = max(st["max_depth"], depth)
+        _log_ui.debug("flush: depth %d, %.2f ms%s", depth, ms, ", rest deferred" if i < len(queue) else "")
+
+    def _requeue(self, rest):
+        """Puts unfinished work back in front; batches that started collecting again merge into it."""
+        with self._lock:
+            for entry in rest:
+                if isinstance(entry, list):
+                    newer = self._batches.get(entry[0])
+                    if newer is not None:
+                        entry[2].extend(newer[2]); self._queue = [e for e in self._queue if e is not newer]
+                    self._batches[entry[0]] = entry
+            self._queue[:0] = rest; self._armed = True; self.stats["deferred"] += 1
+        self._schedule()
+
+    def summary(self):
+        st = self.stats; n = st["flushes"] or 1
+        return (f"{st['posts']} posts in {st['flushes']} flushes ({st['deferred']} over budget), max depth {st['max_depth']}, "
+                f"avg {st['total_ms'] / n:.2f} ms, max {st['max_ms']:.2f} ms per flush")
 
 
 class Window(QMainWindow):
-    def _get(self, url, timeout=10):
-        try:
-            print(f"[HTTP GET] {url}")
-            r = requests.get(url, timeout=timeout, proxies={})
-            try:
-                length = r.headers.get('Content-Length') or len(r.content or b'')
-                snippet = (r.text[:300] + '...') if r.text and len(r.text) > 300 else r.text
-                print(f"[HTTP GET DONE] {r.status_code} length={length}")
-                ct = r.headers.get('Content-Type','')
-                if 'application/json' in ct.lower() or 'text' in ct.lower():
-                    print("[HTTP GET BODY SNIPPET]:", snippet)
-            except Exception:
-                pass
-            return r
-        except Exception as e:
-            print(f"[HTTP GET ERROR] {url} -> {e}")
-            raise
     def __init__(self):
         super().__init__()
-        # Ensure queued UI callbacks run
-        self._invoker = _MainThreadInvoker(self)
+        # Worker -> UI updates, applied in per-frame batches
+        self._dispatch = _UiDispatcher(self)
 
         self.setWindowTitle("Subplace Joiner — Qt")
         self.resize(1280, 820); self.setMinimumSize(780, 560)
         # state
         self._text_color=None; self._btn_color=None; self._card_width=300; self._theme="dark"
-        self._cards=[]; self.root_place_id=None
-        self.thumb_cache = {}  # place_id -> PIL Image
+        self.root_place_id=None; self._roots = {}; self._no_thumb = set()
+        self.pixmap_cache_mb = 48
+        self._pixmaps = PixmapCache(budget=self.pixmap_cache_mb * 1024 * 1024)
+        self._thumb_refresh = QTimer(self); self._thumb_refresh.setSingleShot(True); self._thumb_refresh.setInterval(40)
+        self._thumb_refresh.timeout.connect(self._refresh_thumb_pixmaps)
 
         # Use same settings path as Tk app for compatibility
-        self.settings_path = Path.home() / "AppData/Local/SubplaceJoiner/settings.json"
+        self.settings_path = DATA_DIR / "settings.json"
+        self._settings = SettingsStore(self.settings_path)
+        self.thumb_cache_mb = 64
+        self._thumb_disk = ThumbDiskCache(self.settings_path.parent / "thumbs", budget=self.thumb_cache_mb * 1024 * 1024)
+        self._thumbs = ThumbnailPipeline(on_ready=self._on_thumb_ready, disk_cache=self._thumb_disk)
+        self.search_cache_ttl = 3600
+        self.engine = HoprEngine(self.settings_path.parent, search_cache_ttl=self.search_cache_ttl)
+        self.http = self.engine.http; self._search_cache = self.engine.search_cache
+        # Idle-time warming of favourites + the top recents (requests/hour; 0 turns it off)
+        self.prefetch_budget = 300; self.prefetch_recents = 5
+        self._prefetch = Prefetcher(self.engine, thumbs=self._thumbs, budget=self.prefetch_budget)
         self.recent_ids = []
         self.favorites = set()
         self.cookie_visible = False
         self.disable_join_when_proxy = True
         self._proxy_thread = None
+        self.keep_proxy_warm = False
+        self.log_level = "INFO"; self.log_debug = []; self.log_to_file = False
         self._proxy_ready = False
-        self._search_inflight = False
+        self._jobs = SearchJobs()
         self._search_watchdog = None
         self._apply_theme(self._theme)
-        self._build()
+        self._preload = None
+        t = time.perf_counter(); self._build(); STARTUP["Window._build"] = time.perf_counter() - t
         self._apply_styles()
-        self._load_settings()
+        t = time.perf_counter(); self._load_settings(); STARTUP["_load_settings"] = time.perf_counter() - t
         self._refresh_recents_and_favs()
 
     # ---------- Theme ----------
@@ -525,10 +849,12 @@ class Window(QMainWindow):
         # search card
         search_card = Card()
         srow = QHBoxLayout(); srow.setSpacing(10)
-        self.search = Search("Enter Place ID"); srow.addWidget(self.search, 2)
+        self.search = Search("Enter Place ID (or several, comma/space separated)"); srow.addWidget(self.search, 2)
         self.search_btn = AccentButton("Search"); srow.addWidget(self.search_btn)
+        self.ids_btn = GhostButton("IDs from file…"); srow.addWidget(self.ids_btn)
         self.fav_btn = GhostButton("★ Fav"); srow.addWidget(self.fav_btn)
         self.search_btn.clicked.connect(lambda _checked=False: self.on_search_clicked())
+        self.ids_btn.clicked.connect(self.on_ids_from_file)
         self.search.returnPressed.connect(lambda: self.on_search_clicked())
         self.fav_btn.clicked.connect(self.on_toggle_favorite)
         search_card.body().addLayout(srow)
@@ -560,44 +886,41 @@ class Window(QMainWindow):
         self.right_wrap = QWidget(); self.right_layout = QVBoxLayout(self.right_wrap); self.right_layout.setContentsMargins(HANDLE_GUTTER,0,0,0); self.right_layout.setSpacing(0)
         right_card = Card("RESULTS"); right_card.setMinimumWidth(240)
         self.scroll = QScrollArea(); self.scroll.setWidgetResizable(True); self.scroll.setFrameShape(QFrame.NoFrame)
-        self.grid_host = QWidget(); self.grid_host.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.grid = QGridLayout(self.grid_host); self.grid.setContentsMargins(8,8,8,8); self.grid.setHorizontalSpacing(12); self.grid.setVerticalSpacing(12); self.grid.setAlignment(Qt.AlignTop)
-        self.scroll.setWidget(self.grid_host); right_card.body().addWidget(self.scroll, 1)
+        self.results = ResultsGrid(self.scroll, lambda p: PlaceCard(p, on_join=self.join_flow, on_open=self.open_in_browser),
+                                   on_bound=self._on_cards_bound)
+        self.scroll.setWidget(self.results); right_card.body().addWidget(self.scroll, 1)
         self.right_layout.addWidget(right_card)
         main_split = ThinSplitter(Qt.Horizontal); main_split.setChildrenCollapsible(True); main_split.setCollapsible(0, True); main_split.setHandleWidth(HANDLE_HIT)
         main_split.addWidget(left_wrap); main_split.addWidget(self.right_wrap); main_split.setSizes([320, 900])
         self.main_split = main_split; self.main_split.splitterMoved.connect(lambda *_: (self._snap_left_closed(), self._apply_collapse_margin()))
         outer.addWidget(self.main_split, 1)
-        self.grid_host.installEventFilter(self)
         # footer
         foot = QHBoxLayout(); self.status = QLabel("Ready."); self.status.setObjectName("Caption"); foot.addWidget(self.status); foot.addStretch(1); outer.addLayout(foot)
         self._reflow_grid(); self._scale_thumbs(); QTimer.singleShot(0, self._apply_collapse_margin)
 
     # ---------- Event/layout helpers ----------
-    def eventFilter(self, obj, event):
-        if obj is self.grid_host and event.type() == QEvent.Resize:
-            self._reflow_grid()
-        return super().eventFilter(obj, event)
     def _reflow_grid(self):
-        width = max(self.grid_host.width(), 1); cols = max(1, width // self._card_width)
-        widgets=[]
-        while self.grid.count():
-            it = self.grid.takeAt(0); w = it.widget();
-            if w: widgets.append(w)
-        for i, w in enumerate(widgets):
-            self.grid.addWidget(w, i // cols, i % cols)
+        self.results.set_card_width(self._card_width)
     def _scale_thumbs(self):
         scale = max(0.55, min(1.45, (self._card_width / 300.0)))
-        for i in range(self.grid.count()):
-            item = self.grid.itemAt(i); w = item.widget()
-            if isinstance(w, PlaceCard):
-                w.set_thumb_scale(scale)
-                # Re-apply thumbnail at new size if it exists
-                place_id = w.place.get('id')
-                if place_id in self.thumb_cache:
-                    pix = self._pil_to_qpix(self.thumb_cache[place_id])
-                    if pix:
-                        w.thumb.setPixmap(pix.scaled(w.thumb.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.results.set_scale(scale)
+        # Pixmaps are swapped once the slider settles, from the per-bucket cache
+        self._thumb_refresh.start()
+    def _refresh_thumb_pixmaps(self):
+        missing = []
+        for w in self.results.cards():
+            pid = w.place.get('id')
+            if w.thumb_bucket == PixmapCache.bucket(w.thumb_side):
+                continue
+            pix = self._pixmaps.get(pid, w.thumb_side)
+            if pix is not None:
+                self._apply_thumb(w, pix)
+            elif w.thumb_bucket is not None:
+                missing.append(pid)  # had an icon but its source was evicted
+        if missing:
+            self._thumbs.request(missing)
+        used, n = self._pixmaps.footprint()
+        _log_thumb.debug("pixmap cache: %d entries, %.1f MB", n, used / 1048576)
     def _apply_collapse_margin(self):
         sizes = self.main_split.sizes();
         if not sizes: return
@@ -634,20 +957,22 @@ class Window(QMainWindow):
 
     # ---------- Search / Results ----------
     def on_search_clicked(self, *_):
-        if self._search_inflight:
-            print("[SEARCH] ignored: already running")
-            return
-        place_id = self.search.text().strip()
-        if not place_id.isdigit():
-            self._set_error("⚠️ Place ID must be a number"); return
-        self._set_error(""); self.status.setText("Searching…"); self.search_btn.setEnabled(False); self.search_btn.setText("Searching…")
-        self._search_inflight = True
-        # history update (always persist)
-        if place_id in self.recent_ids:
-            self.recent_ids.remove(place_id)
-        self.recent_ids.insert(0, place_id)
-        self._save_settings(force=True); self._refresh_recents_and_favs()
-        print(f"[SEARCH] start place={place_id}")
+        ids = list(dict.fromkeys(t for t in re.split(r"[\s,;]+", self.search.text()) if t))
+        if not ids or not all(t.isdigit() for t in ids):
+            self._set_error("⚠️ Place ID must be a number" if len(ids) <= 1 else "⚠️ Place IDs must be numbers"); return
+        self._set_error(""); self.status.setText("Searching…"); self.search_btn.setText("Searching…")
+        # A new search supersedes the running one: its pagination, timestamps and icon lookups stop
+        # and anything it still posts to the UI is dropped
+        job = self._jobs.start()
+        self._thumbs.clear(); self._prefetch.pause(); self._roots = {}
+        if len(ids) == 1:
+            # history update (always persist); batches stay out of the recents row
+            place_id = ids[0]
+            if place_id in self.recent_ids:
+                self.recent_ids.remove(place_id)
+            self.recent_ids.insert(0, place_id)
+            self._save_settings(force=True); self._refresh_recents_and_favs()
+        _log_search.info("start place=%s", ",".join(ids))
         # watchdog: auto-unstick UI after 15s
         try:
             if self._search_watchdog is not None:
@@ -657,211 +982,238 @@ class Window(QMainWindow):
         self._search_watchdog = QTimer(self); self._search_watchdog.setSingleShot(True)
         self._search_watchdog.timeout.connect(self._search_timeout)
         self._search_watchdog.start(15000)
-        threading.Thread(target=self._search_worker, args=(place_id,), daemon=True).start()
+        if len(ids) == 1:
+            job.spawn(self._search_worker, job, ids[0])
+        else:
+            job.spawn(self._batch_search_worker, job, ids)
 
-    def _search_worker(self, place_id: str):
-        print("[SEARCH] worker begin")
+    def on_ids_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Place IDs", "", "Text files (*.txt *.csv);;All files (*)")
+        if not path:
+            return
         try:
-            # Step 1: Get universe ID from place
-            u = self._get(f"https://apis.roblox.com/universes/v1/places/{place_id}/universe", timeout=10)
-            u.raise_for_status()
-            universe_data = u.json()
-            universe_id = universe_data.get("universeId")
-            if not universe_id:
-                raise Exception("Invalid Place ID or universe not found")
-
-            # Step 1.5: Get the actual root place ID from universe details
-            universe_details = self._get(f"https://games.roblox.com/v1/games?universeIds={universe_id}", timeout=10)
-            universe_details.raise_for_status()
-            games_data = universe_details.json().get("data", [])
-            if games_data:
-                self.root_place_id = games_data[0].get("rootPlaceId")
-            else:
-                # Fallback: assume searched place is root if we can't get universe details
-                self.root_place_id = int(place_id)
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                ids = re.findall(r"\d+", f.read())
+        except Exception as e:
+            self._set_error(f"⚠️ {e}"); return
+        if not ids:
+            self._set_error("⚠️ No place IDs in that file"); return
+        self.search.setText(", ".join(dict.fromkeys(ids))); self.on_search_clicked()
+
+    def _post(self, job, fn):
+        """_on_main for search workers: `fn` only runs if `job` is still the current search."""
+        self._on_main(lambda: fn() if self._jobs.is_current(job) else None)
+
+    def _set_root(self, job, root):
+        self._post(job, lambda: setattr(self, "root_place_id", root))
 
-            cursor = None
+    def _search_worker(self, job, place_id: str):
+        _log_search.debug("worker #%d begin", job.gen)
+        loader = None
+        try:
+            universe_id = self.engine.resolve_universe(place_id)
+            job.check()
+            # Timestamps load in the background (bounded, rate-limited, cancelled with the job)
+            cookie = self.cookie_edit.text().strip() or self.engine.get_roblosecurity() or ""
+            loader = self._start_timestamp_loader(job, cookie)
+
+            cached = self._search_cache.listing(universe_id)
+            if cached is not None:
+                root, places, fresh = cached
+                self._set_root(job, root)
+                _log_search.info("cache hit universe=%s places=%d fresh=%s", universe_id, len(places), fresh)
+                self._post(job, lambda pl=places: (self.display_results(pl), self._on_results_complete(len(pl), 0, "cached")))
+                # A stale listing re-reads every place's Created/Updated (the column people watch);
+                # a fresh one only fills the gaps
+                loader.submit(places if not fresh else [p for p in places if not p.get("updated")])
+                if not fresh:
+                    self._revalidate_listing(job, universe_id, place_id, places, loader)
+                return
+
+            root = self.engine.fetch_root_place(universe_id, place_id)
+            job.check()
+            self._set_root(job, root)
+            _log_search.debug("root place ID detected as %s", root)
             all_places = []
-            seen = set()
-
-            # Step 2: Paginate through all places and display immediately
-            while True:
-                url = f"https://develop.roblox.com/v1/universes/{universe_id}/places?limit=100"
-                if cursor:
-                    url += f"&cursor={cursor}"
-                r = self._get(url, timeout=10)
-                r.raise_for_status()
-                data = r.json()
-                batch = data.get("data", [])
-
-                if not batch:
-                    print("[DEBUG] Empty batch received, stopping.")
-                    break
-
-                # Process batch and add to all_places immediately
-                for p in batch:
-                    pid = p.get("id")
-                    if pid in seen:
-                        continue
-                    seen.add(pid)
-                    
-                    # Set default values for timestamps
-                    p["created"] = None
-                    p["updated"] = None
-                    
-                    # Mark root place - now using the actual root place ID
-                    if self.root_place_id and int(pid) == int(self.root_place_id):
-                        p["is_root"] = True
-                    
-                    all_places.append(p)
-
-                # Check next cursor
-                next_cursor = data.get("nextPageCursor")
-                if not next_cursor or next_cursor == cursor:
-                    break
-                cursor = next_cursor
-
-            print("[DEBUG] Got all places, displaying immediately:", len(all_places))
-            print(f"[DEBUG] Root place ID detected as: {self.root_place_id}")
-            
-            # Display results immediately without timestamps
-            self._on_main(lambda: (self._debug_api_detected(len(all_places)), self.display_results(all_places.copy())))
-
-            # Now load timestamps asynchronously in background
-            cookie = self.cookie_edit.text().strip() or self.get_roblosecurity() or ""
-            
-            def load_timestamps():
-                updated_places = []
-                for i, p in enumerate(all_places):
-                    pid = p.get("id")
-                    
-                    while True:
-                        try:
-                            asset_url = f"https://economy.roblox.com/v2/assets/{pid}/details"
-                            response = requests.get(asset_url, cookies={".ROBLOSECURITY": cookie}, timeout=10)
-                            response.raise_for_status()
-                            asset_data = response.json()
-
-                            p["created"] = asset_data.get("Created")
-                            p["updated"] = asset_data.get("Updated")
-                            
-                            print(f"[DEBUG] Place {pid}: created={p['created']}, updated={p['updated']}")
-                            break
-
-                        except requests.HTTPError as err:
-                            status = getattr(err.response, "status_code", None)
-                            if status in (429, 500, 502, 503, 504):
-                                print(f"[WARN] Rate-limited or server error on {pid} (HTTP {status}); retrying in 1 s…")
-                                time.sleep(1)
-                                continue
-                            else:
-                                print(f"[WARN] HTTP error on {pid}: {err}")
-                                break
-
-                        except Exception as perr:
-                            print(f"[WARN] Could not fetch asset details for {pid}: {perr}")
-                            break
-                    
-                    updated_places.append(p)
-                    
-                    # Update UI periodically (every 5 places) to show progress
-                    if (i + 1) % 5 == 0 or i == len(all_places) - 1:
-                        places_copy = updated_places.copy()
-                        self._on_main(lambda pc=places_copy: self._update_existing_cards_with_timestamps(pc))
-
-            # Start timestamp loading in separate thread
-            threading.Thread(target=load_timestamps, daemon=True).start()
+            page_no = 0
+
+            # Step 2: Paginate through all places and stream each page into the grid
+            for page in self.engine.iter_place_pages(universe_id, root, cancel=job.cancel_event):
+                job.check()
+                all_places.extend(page); page_no += 1
+                self._post(job, lambda pg=page, n=page_no, total=len(all_places): self._on_results_page(pg, n, total))
+                loader.submit(page)
+
+            _log_search.debug("got all places: %d", len(all_places))
+            self._search_cache.store_listing(universe_id, root, all_places)
+            self._post(job, lambda n=len(all_places), pages=page_no: self._on_results_complete(n, pages))
+
+        except SearchCancelled as e:
+            _log_search.info("%s", e)
 
         except Exception as e:
-            self._on_main(lambda err=e: self._set_error(f"⚠️ {err}"))
+            self._post(job, lambda err=e: self._set_error(f"⚠️ {err}"))
 
         finally:
-            self._on_main(lambda: self._search_done_ui_reset())
+            if loader is not None:
+                loader.close()
+            self._post(job, self._search_done_ui_reset)
+            _log_search.debug("worker #%d end", job.gen)
+
+    def _batch_search_worker(self, job, place_ids):
+        """Many place IDs: universes resolve concurrently, each universe is listed once and lands as one group."""
+        _log_search.debug("batch worker #%d begin (%d ids)", job.gen, len(place_ids))
+        loader = None
+        try:
+            cookie = self.cookie_edit.text().strip() or self.engine.get_roblosecurity() or ""
+            loader = self._start_timestamp_loader(job, cookie)
+            seq = iter(range(len(place_ids))); lock = threading.Lock()
+            def on_group(group):
+                with lock:
+                    # the first group to arrive replaces the previous results; posts keep arrival order
+                    self._post(job, lambda g=group, n=next(seq): self._on_batch_group(g, n))
+                loader.submit([p for p in group["places"] if not p.get("updated")])
+            groups, errors = self.engine.search_many(place_ids, timestamps=False, on_group=on_group, cancel=job.cancel_event)
+            total = sum(len(g["places"]) for g in groups)
+            note = f"{len(groups)} universe{'s' if len(groups) != 1 else ''} from {len(place_ids)} IDs"
+            if errors:
+                failed = ", ".join(str(e["place_id"]) for e in errors[:5]) + ("…" if len(errors) > 5 else "")
+                self._post(job, lambda: self._set_error(f"⚠️ {len(errors)} ID{'s' if len(errors) != 1 else ''} failed: {failed}"))
+            self._post(job, lambda: self._on_results_complete(total, 0, note))
+        except SearchCancelled as e:
+            _log_search.info("%s", e)
+        except Exception as e:
+            self._post(job, lambda err=e: self._set_error(f"⚠️ {err}"))
+        finally:
+            if loader is not None:
+                loader.close()
+            self._post(job, self._search_done_ui_reset)
+            _log_search.debug("batch worker #%d end", job.gen)
+
+    def _on_batch_group(self, group, n):
+        root = group["root_place_id"]
+        places = self._normalize_places(group["places"])
+        self._roots.update((p.get("id"), root) for p in places)
+        if n == 0:
+            self.root_place_id = None; self.display_results([])
+        # One header row per universe: which of the requested IDs led there
+        asked = group["place_ids"]
+        ids = ", ".join(map(str, asked[:6])) + ("…" if len(asked) > 6 else "")
+        self.results.append_section(f"Universe {group['universe_id']} • {'IDs' if len(asked) > 1 else 'ID'} {ids} • "
+                                    f"{len(places)} place{'s' if len(places) != 1 else ''}", places)
+        self.status.setText(f"Loading… {n + 1} universe{'s' if n else ''} • {len(self.results.places)} places")
+
+    def _revalidate_listing(self, job, universe_id, place_id, cached_places, loader):
+        """Background refresh of a stale listing; only added/removed places reach the grid."""
+        self._post(job, lambda: self.status.setText(self.status.text() + " • refreshing…"))
+        root = self.engine.fetch_root_place(universe_id, place_id)
+        fetched = [p for page in self.engine.iter_place_pages(universe_id, root, cancel=job.cancel_event) for p in page]
+        job.check()
+        old = {p.get("id"): p for p in cached_places}
+        new_ids = {p.get("id") for p in fetched}
+        # Keep the cached dicts (they carry timestamps and are bound to cards); take new ones as-is
+        merged = [old.get(p.get("id"), p) for p in fetched]
+        for p in merged:
+            if root and int(p.get("id")) == int(root): p["is_root"] = True
+            else: p.pop("is_root", None)
+        added = [p for p in fetched if p.get("id") not in old]
+        removed = [pid for pid in old if pid not in new_ids]
+        self._set_root(job, root)
+        self._search_cache.store_listing(universe_id, root, merged)
+        _log_search.info("revalidated universe=%s: +%d -%d", universe_id, len(added), len(removed))
+        self._post(job, lambda: self._apply_listing_diff(added, removed, len(merged)))
+        loader.submit(added)
+
+    def _apply_listing_diff(self, added, removed, total):
+        if removed:
+            self.results.remove_places(removed)
+        if added:
+            self.results.append_places(self._normalize_places(added))
+        self.status.setText(f"Found {total} places (refreshed: +{len(added)} -{len(removed)})")
+
+    def _on_results_page(self, page, page_no, total):
+        # First page replaces the previous search; later pages are appended without touching existing cards
+        if page_no == 1:
+            self.display_results(page)
+        else:
+            self.results.append_places(self._normalize_places(page))
+        self.status.setText(f"Loading… page {page_no} • {total} places")
+
+    def _on_results_complete(self, total, pages, note=None):
+        self._debug_api_detected(total)
+        _log_http.info("stats: %s", self.http.summary())
+        _log_ui.info("dispatcher: %s", self._dispatch.summary())
+        if total:
+            self._warm_join_session(self.cookie_edit.text().strip())
+        if total == 0:
+            self.display_results([])
+        elif note:
+            self.status.setText(f"Found {total} places ({note})")
+        else:
+            self.status.setText(f"Found {total} places ({pages} page{'s' if pages != 1 else ''})")
+
+    def _start_timestamp_loader(self, job, cookie):
+        loader = TimestampLoader(cookie=cookie)
+        # Late batches from a superseded search are dropped on the UI side as well
+        loader.on_batch = lambda batch: self._dispatch.post_item("timestamps", (job, batch), self._apply_timestamp_batches)
+        job.on_cancel(loader.cancel)
+        return loader
+
+    def _apply_timestamp_batches(self, items):
+        places = [p for job, batch in items if self._jobs.is_current(job) for p in batch]
+        if places:
+            self._update_existing_cards_with_timestamps(places); self._search_cache.touch()
 
     def _update_existing_cards_with_timestamps(self, updated_places):
         """Update existing PlaceCard widgets with new timestamp data"""
         try:
-            # Create a mapping of place_id -> updated place data
-            place_map = {p.get('id'): p for p in updated_places}
-            
-            # Update existing cards
-            for i in range(self.grid.count()):
-                item = self.grid.itemAt(i)
-                if item and item.widget():
-                    card = item.widget()
-                    if isinstance(card, PlaceCard):
-                        card_id = card.place.get('id')
-                        if card_id in place_map:
-                            # Update the place data
-                            updated_place = place_map[card_id]
-                            card.place.update(updated_place)
-                            
-                            # Update the meta label with new timestamps
-                            created_ago = card.time_ago(updated_place.get('created'))
-                            updated_ago = card.time_ago(updated_place.get('updated'))
-                            
-                            # Find the meta label and update it
-                            for child in card.findChildren(QLabel):
-                                if child.text().startswith("Created:"):
-                                    child.setText(f"Created: {created_ago}\nUpdated: {updated_ago}")
-                                    break
-                                    
+            # Only cards on screen need touching; off-screen places pick the data up from their dicts when bound
+            for updated_place in updated_places:
+                card = self.results.card_for(updated_place.get('id'))
+                if card is not None:
+                    if updated_place is not card.place:
+                        card.place.update(updated_place)
+                    card.refresh_meta()
         except Exception as e:
-            print(f"[DEBUG] Error updating timestamps: {e}")
+            _log_search.warning("error updating timestamps: %s", e)
+
+    def _normalize_places(self, places):
+        if isinstance(places, dict):
+            places = [places]
+        places = [p for p in (places or []) if isinstance(p, dict)]
+        for p in places:
+            pid = p.get('id') or p.get('placeId')
+            if pid is not None:
+                try: p['id'] = int(pid)
+                except Exception: p['id'] = pid
+        return places
 
     def display_results(self, places):
-        while self.grid.count():
-            it = self.grid.takeAt(0); w = it.widget();
-            if w: w.setParent(None)
+        places = self._normalize_places(places)
+        # Drop lookups queued for the previous result set; visible cards re-request their icons
+        self._thumbs.clear(); self._no_thumb = set()
+        self.results.set_places(places)
         if not places:
             self.status.setText("No places found."); return
-        if isinstance(places, dict):
-            places = [places]
-        cols = max(1, max(1, self.grid_host.width() // self._card_width))
-        for i, p in enumerate(places):
-            if isinstance(p, dict):
-                pid = p.get('id') or p.get('placeId')
-                if pid is not None:
-                    try: p['id'] = int(pid)
-                    except Exception: p['id'] = pid
-            card = PlaceCard(p, on_join=self.join_flow, on_open=self.open_in_browser)
-            self.grid.addWidget(card, i // cols, i % cols)
-            # Start thumbnail loading immediately for each card
-            self._load_thumb_async_immediate(p.get('id'), card)
-        self._reflow_grid(); self._scale_thumbs(); self.status.setText(f"Found {len(places)} places")
-
-    def _load_thumb_async_immediate(self, place_id, card: PlaceCard):
-        """Load thumbnail immediately without waiting"""
-        def worker():
-            try:
-                pix = self._fetch_thumb_pixmap(place_id)
-                self._on_main(lambda: self._apply_thumb(card, pix))
-            except Exception as e:
-                print(f"[THUMB] Error loading thumbnail for {place_id}: {e}")
-                self._on_main(lambda: card.thumb.setText("(no image)"))
-        threading.Thread(target=worker, daemon=True).start()
+        self.status.setText(f"Found {len(places)} places")
 
     def _search_done_ui_reset(self):
+        self._prefetch.resume()
         try:
             if self._search_watchdog is not None:
                 self._search_watchdog.stop()
         except Exception:
             pass
-        self._search_inflight = False
         try:
-            self.search_btn.setEnabled(True)
             self.search_btn.setText("Search")
             if not self.status.text() or self.status.text().strip().lower()=="searching…":
                 self.status.setText("Ready.")
         except Exception:
             pass
-        print("[SEARCH] worker end")
 
     def _search_timeout(self):
-        print("[SEARCH] watchdog fired — resetting UI")
-        self._search_inflight = False
+        _log_search.warning("watchdog fired, resetting UI")
         try:
-            self.search_btn.setEnabled(True)
             self.search_btn.setText("Search")
             if not self.status.text() or self.status.text().strip().lower()=="searching…":
                 self.status.setText("Timed out. Try again.")
@@ -871,47 +1223,55 @@ class Window(QMainWindow):
     def _debug_api_detected(self, count):
         try:
             msg = f"[DEBUG] API responded with {count} places"
-            print(msg)
+            _log_search.debug("API responded with %d places", count)
             self.debug_lbl.setText(msg)
         except Exception as e:
-            print("[DEBUG] failed to update debug label", e)
+            _log_ui.debug("failed to update debug label: %s", e)
 
     # ---------- Thumbs ----------
-    def _load_thumb_async(self, place_id, card: PlaceCard):
-        def worker():
-            pix = self._fetch_thumb_pixmap(place_id)
-            self._on_main(lambda: self._apply_thumb(card, pix))
-        threading.Thread(target=worker, daemon=True).start()
+    def _on_thumb_ready(self, place_id, img):
+        # pipeline thread -> UI thread, batched per frame; the QImage is built here, off the UI thread
+        self._dispatch.post_item("thumbs", (place_id, self._pil_to_qimage(img)), self._apply_thumbs)
+    def _on_cards_bound(self, cards):
+        # Visibility-driven loading: only cards that just scrolled into view ask for icons
+        missing = []
+        for card in cards:
+            pid = card.place.get('id')
+            if pid in self._no_thumb:
+                self._apply_thumb(card, None); continue
+            pix = self._pixmaps.get(pid, card.thumb_side)
+            if pix is not None:
+                self._apply_thumb(card, pix)
+            else:
+                missing.append(pid)
+        if missing:
+            self._thumbs.request(missing)
+    def _apply_thumbs(self, items):
+        ready = {}
+        for place_id, qimg in items:
+            if qimg is not None:
+                self._pixmaps.put_source(place_id, qimg); self._no_thumb.discard(place_id)
+            else:
+                self._no_thumb.add(place_id)
+            ready[place_id] = qimg is not None
+        for pid, ok in ready.items():
+            w = self.results.card_for(pid)
+            if w is not None:
+                self._apply_thumb(w, self._pixmaps.get(pid, w.thumb_side) if ok else None)
     def _apply_thumb(self, card: PlaceCard, pix: QPixmap|None):
         if pix is None:
-            card.thumb.setText("(no image)"); return
-        card.thumb.setPixmap(pix.scaled(card.thumb.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-    def _fetch_thumb_pixmap(self, place_id) -> QPixmap|None:
-        if place_id in self.thumb_cache:
-            return self._pil_to_qpix(self.thumb_cache[place_id])
-        try:
-            meta = self._get(f"https://thumbnails.roblox.com/v1/places/gameicons?placeIds={place_id}&size=512x512&format=Png", timeout=10)
-            meta.raise_for_status(); data = meta.json(); img_url = data.get("data", [{}])[0].get("imageUrl")
-            if not img_url: return None
-            img_response = self._get(img_url, timeout=10); img_response.raise_for_status()
-            pil = Image.open(BytesIO(img_response.content)).convert("RGBA")
-            size = min(pil.width, pil.height)
-            img = pil.resize((size, size))
-            mask = Image.new("L", (size, size), 0); draw = ImageDraw.Draw(mask); draw.rounded_rectangle((0,0,size,size), radius=size//6, fill=255)
-            img.putalpha(mask)
-            self.thumb_cache[place_id] = img
-            return self._pil_to_qpix(img)
-        except Exception:
-            return None
-    def _pil_to_qpix(self, pil_img) -> QPixmap|None:
+            card.thumb.setText("(no image)"); card.thumb_bucket = None; return
+        card.thumb.setPixmap(pix); card.thumb_bucket = PixmapCache.bucket(card.thumb_side)
+    @staticmethod
+    def _pil_to_qimage(pil_img) -> QImage|None:
+        """QImage over the PIL image's RGBA bytes: one copy out of Pillow (tobytes), none into Qt, no PNG round trip."""
         if pil_img is None: return None
-        if ImageQt is None:
-            b = BytesIO(); pil_img.save(b, format='PNG'); b.seek(0)
-            qimg = QImage.fromData(b.read(), 'PNG'); return QPixmap.fromImage(qimg)
-        qimg = ImageQt(pil_img)
-        if isinstance(qimg, QImage):
-            return QPixmap.fromImage(qimg)
-        return QPixmap.fromImage(QImage(qimg))
+        if pil_img.mode != "RGBA":
+            pil_img = pil_img.convert("RGBA")
+        buf = pil_img.tobytes()
+        qimg = QImage(buf, pil_img.width, pil_img.height, pil_img.width * 4, QImage.Format_RGBA8888)
+        qimg._buf = buf  # QImage only borrows the buffer; keep it alive as long as the image
+        return qimg
 
     # ---------- Favorites / Recents ----------
     def on_toggle_favorite(self):
@@ -930,6 +1290,7 @@ class Window(QMainWindow):
             chip.clicked.connect(lambda _, t=chip.text(): self._quick_search(t))
         for chip in self.fav_flow.chips:
             chip.clicked.connect(lambda _, t=chip.text(): self._quick_search(t))
+        self._prefetch.set_targets(self.recent_ids[:self.prefetch_recents] + sorted(self.favorites, key=lambda x:int(x)))
         cur = self.search.text().strip()
         if cur and cur in self.favorites:
             self.fav_btn.setText("★ Faved")
@@ -947,7 +1308,7 @@ class Window(QMainWindow):
 
     # ---------- Join flow ----------
     def join_flow(self, place_id):
-        
+        t0 = time.perf_counter()
         # Record subplace in recents immediately
         pid = str(place_id)
         if pid.isdigit():
@@ -956,273 +1317,64 @@ class Window(QMainWindow):
             self.recent_ids.insert(0, pid)
             self._save_settings(force=True); self._refresh_recents_and_favs()
 
-        cookie = (self.cookie_edit.text().strip() or self.get_roblosecurity() or "")
-        try:
-            # Pre-seed join for ROOT explicitly (backend expects root first)
-            root = int(self.root_place_id or place_id)
-            if cookie:
-                ok = self._preseed_join_root(root, cookie)
-                if not ok:
-                    self._set_error("⚠️ GameJoin seed failed; launching anyway…")
-            self.status.setText("Launching Roblox…")
-            print("[DEEPLINK FIRING]", f"roblox://experiences/start?placeId={place_id}", "root", self.root_place_id)
-            self.launch_roblox(place_id)
-            self.start_proxy_thread()
-        except Exception as e:
-            self._set_error(f"⚠️ {e}"); self.status.setText("Failed to launch Roblox")
-
-    def _new_session(self, cookie: str|None):
-        sess = requests.Session()
-        # IMPORTANT: avoid inheriting system proxies; don't let mitm catch this pre-seed
-        sess.trust_env = False
-        sess.proxies = {}
-        sess.headers.update({
-            "User-Agent": "Roblox/WinInet",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Referer": "https://www.roblox.com/",
-            "Origin": "https://www.roblox.com",
-        })
-        if cookie:
-            sess.headers["Cookie"] = f".ROBLOSECURITY={cookie};"
-        # X-CSRF
-        try:
-            r = sess.post("https://auth.roblox.com/v2/logout", timeout=10)
-            token = r.headers.get("x-csrf-token") or r.headers.get("X-CSRF-TOKEN")
-            if token:
-                sess.headers["X-CSRF-TOKEN"] = token
-        except Exception:
-            pass
-        return sess
+        cookie = (self.cookie_edit.text().strip() or self.engine.get_roblosecurity() or "")
+        # Pre-seed join for ROOT explicitly (backend expects root first)
+        root = int(self._roots.get(place_id) or self.root_place_id or place_id)
+        warm = bool(cookie) and self.engine.has_join_session(cookie)
+        def fire():
+            try:
+                self.status.setText("Launching Roblox…")
+                _log_join.info("deeplink roblox://experiences/start?placeId=%s (root %s), %.1f ms after click",
+                               place_id, root, (time.perf_counter() - t0) * 1000)
+                self.engine.launch_roblox(place_id)
+                self.start_proxy_thread()
+            except Exception as e:
+                self._set_error(f"⚠️ {e}"); self.status.setText("Failed to launch Roblox")
+        def preseed(then=None):
+            ok = self.engine.preseed_join_root(root, cookie)
+            if not ok:
+                self._on_main(lambda: self._set_error("⚠️ GameJoin seed failed; launching anyway…"))
+            if then is not None:
+                self._on_main(then)
+        if not cookie:
+            fire()
+        elif warm:
+            # Primed session: the pre-seed is one keep-alive POST, far quicker than the client's startup,
+            # so the deeplink goes out immediately and the seed runs alongside it
+            threading.Thread(target=preseed, name="preseed", daemon=True).start(); fire()
+        else:
+            self.status.setText("Preparing join…")
+            threading.Thread(target=preseed, args=(fire,), name="preseed", daemon=True).start()
 
-    def _preseed_join_root(self, root_place_id: int, cookie: str):
-        try:
-            sess = self._new_session(cookie)
-            payload = {
-                "placeId": int(root_place_id),
-                "isTeleport": True,
-                "isImmersiveAdsTeleport": False,
-                "gameJoinAttemptId": str(uuid.uuid4()),
-            }
-            print("[JOIN PRESEED FIRING]", json.dumps(payload, indent=2))
-            r = sess.post("https://gamejoin.roblox.com/v1/join-game", json=payload, timeout=15)
-            print("[JOIN PRESEED STATUS]", r.status_code)
-            try: print("[JOIN PRESEED BODY]", r.text[:800])
-            except Exception: pass
-            data = {}
-            try: data = r.json()
-            except Exception: pass
-            # Status 2 == ready to join
-            return (r.status_code == 200 and data.get("status") == 2)
-        except Exception as e:
-            print("[JOIN PRESEED ERROR]", e)
-            return False
+    def _warm_join_session(self, cookie_text):
+        """Primes the pooled join session (CSRF + TLS) in the background so the next Join skips it."""
+        def run():
+            cookie = cookie_text or self.engine.get_roblosecurity() or ""
+            if cookie and not self.engine.has_join_session(cookie):
+                self.engine.join_session(cookie)
+        threading.Thread(target=run, name="join-warmup", daemon=True).start()
 
     def start_proxy_thread(self):
-        if not MITM_AVAILABLE or psutil is None:
+        if not proxy_available():
             self.status.setText("Proxy not available. (Install mitmproxy + psutil for full flow)")
             return
         if getattr(self, "_proxy_thread", None) and self._proxy_thread.is_alive():
             return
+        def on_status(msg): self._on_main(lambda: self.status.setText(msg))
+        def on_done(msg): self._on_main(lambda: (self._enable_disable_join_buttons(True), self.status.setText(msg)))
         def runner():
-            asyncio.run(self._proxy_main())
+            import asyncio
+            asyncio.run(self.engine.run_proxy(on_status=on_status, on_done=on_done, warm=self.keep_proxy_warm))
         self._proxy_thread = threading.Thread(target=runner, daemon=True)
         self._proxy_thread.start()
         self.status.setText("Proxy running…")
         if self.disable_join_chk.isChecked():
             self._enable_disable_join_buttons(False)
 
-    async def _proxy_main(self):
-        PROXY_HOST = "127.0.0.1"; PROXY_PORT = 51823
-        proxy_settings = {
-            "DFStringHttpCurlProxyHostAndPort": f"{PROXY_HOST}:{PROXY_PORT}",
-            "DFStringDebugPlayerHttpProxyUrl": f"http://{PROXY_HOST}:{PROXY_PORT}",
-            "DFFlagDebugEnableHttpProxy": "True",
-            "DFStringHttpCurlProxyHostAndPortForExternalUrl": f"{PROXY_HOST}:{PROXY_PORT}",
-        }
-        class Interceptor:
-            WANTED = (
-                "/v1/join-game",
-                "/v1/join-game-instance",
-                "/v1/join-play-together-game",
-                "/v1/join-play-together-game-instance",
-            )
-            def request(self, flow: 'http.HTTPFlow') -> None:
-                url = flow.request.pretty_url
-                if any(p in url for p in self.WANTED):
-                    content_type = flow.request.headers.get("Content-Type", "")
-                    if "application/json" in content_type.lower():
-                        try:
-                            body_json = flow.request.json()
-                        except Exception:
-                            return
-                        if "isTeleport" not in body_json:
-                            body_json["isTeleport"] = True
-                            print("added teleport")
-                        body_json.setdefault("gameJoinAttemptId", str(uuid.uuid4()))
-                        flow.request.set_text(json.dumps(body_json))
-            def response(self, flow: 'http.HTTPFlow') -> None:
-                pass
-        options = Options(listen_host=PROXY_HOST, listen_port=PROXY_PORT)
-        master = DumpMaster(options, with_termlog=False, with_dumper=False)
-        master.addons.add(Interceptor())
-        asyncio.create_task(master.run())
-        # Wait for Roblox start & restore settings similar to original
-        ca_path = Path.home() / ".mitmproxy" / "mitmproxy-ca-cert.pem"
-        for _ in range(200):
-            if ca_path.exists():
-                break
-            await asyncio.sleep(0.05)
-        apps = {
-            "Roblox": Path.home() / "AppData/Local/Roblox",
-            "Bloxstrap": Path.home() / "AppData/Local/Bloxstrap",
-            "Fishstrap": Path.home() / "AppData/Local/Fishstrap",
-        }
-        original_settings = {}
-        for app_name, path in apps.items():
-            versions_path = path / "Versions"
-            if not versions_path.exists():
-                continue
-            for version_folder in versions_path.iterdir():
-                if not version_folder.is_dir():
-                    continue
-                exe_files = list(version_folder.glob("*PlayerBeta.exe"))
-                if not exe_files:
-                    continue
-                # Ensure libcurl bundle includes mitm CA
-                ssl_folder = version_folder / "ssl"; ssl_folder.mkdir(exist_ok=True)
-                ca_file = ssl_folder / "cacert.pem"
-                try:
-                    if ca_path.exists():
-                        mitm_ca_content = ca_path.read_text(encoding="utf-8")
-                        if ca_file.exists():
-                            existing_content = ca_file.read_text(encoding="utf-8")
-                            if mitm_ca_content not in existing_content:
-                                with open(ca_file, "a", encoding="utf-8") as f:
-                                    f.write("\n" + mitm_ca_content)
-                        else:
-                            with open(ca_file, "w", encoding="utf-8") as f:
-                                f.write(mitm_ca_content)
-                except Exception:
-                    pass
-        # ClientSettings override
-        roblox_path = Path.home() / "AppData" / "Local" / "Roblox"
-
-        if not roblox_path.exists():
-            messagebox.showwarning("Roblox not found", "Please install Roblox")
-
-        # File path
-        file_path = roblox_path / "ClientSettings" / "IxpSettings.json"
-
-        if not file_path.exists():
-            print("File does not exist, creating it.")
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.touch()
-        try:
-            existing = {}
-            if file_path.exists():
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-            original_settings[str(file_path)] = existing
-            updated = dict(existing); updated.update(proxy_settings)
-            
-            os.chmod(file_path, stat.S_IWRITE)
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(updated, f, indent=4)
-            os.chmod(file_path, stat.S_IREAD)
-        except Exception:
-            pass
-        self._on_main(lambda: self.status.setText("Waiting for Roblox to start…"))
-        count=0
-        while True:
-            if psutil and any((p.info.get('name') or '').lower()=="robloxplayerbeta.exe" for p in psutil.process_iter(['name'])):
-                break
-            else:
-                count += 1
-                if count >= 100:
-                    for file_path, content in original_settings.items():
-                        try:
-                            os.chmod(file_path, stat.S_IWRITE)
-                            with open(file_path, "w", encoding="utf-8") as f:
-                                json.dump(content, f, indent=4)
-                            os.chmod(file_path, stat.S_IREAD)
-                        except Exception:
-                            pass
-                    try:
-                        await master.shutdown()
-                    except Exception:
-                        pass
-                    self._on_main(lambda: (self._enable_disable_join_buttons(True), self.status.setText("Proxy stopped. Roblox did not open.")))
-                    return
-            await asyncio.sleep(0.1)
-
-        count = 0
-        while True:
-            if any((p.info.get('name') or '').lower() == "robloxcrashhandler.exe" for p in psutil.process_iter(['name'])):
-                break
-            if not any((p.info.get('name') or '').lower() == "robloxplayerbeta.exe" for p in psutil.process_iter(['name'])):
-                count += 1
-                if count >= 50:
-                    for file_path, content in original_settings.items():
-                        try:
-                            os.chmod(file_path, stat.S_IWRITE)
-                            with open(file_path, "w", encoding="utf-8") as f:
-                                json.dump(content, f, indent=4)
-                            os.chmod(file_path, stat.S_IREAD)
-                        except Exception as e:
-                            print(f"[proxy] restore failed {file_path}: {e}")
-                    try:
-                        await master.shutdown()
-                    except Exception:
-                        pass
-                    self._on_main(lambda: (self._enable_disable_join_buttons(True), self.status.setText("Proxy stopped. Roblox closed unexpectedly.")))
-                    return
-            else:
-                count = 0
-            await asyncio.sleep(0.1)
-
-        # After start, restore original files
-        for file_path, content in original_settings.items():
-            try:
-                os.chmod(file_path, stat.S_IWRITE)
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(content, f, indent=4)
-                os.chmod(file_path, stat.S_IREAD)
-            except Exception:
-                pass
-        # Wait for exit, then shutdown
-        while True:
-            if psutil and not any((p.info.get('name') or '').lower()=="robloxplayerbeta.exe" for p in psutil.process_iter(['name'])):
-                try:
-                    await master.shutdown()
-                except Exception:
-                    pass
-                self._on_main(lambda: (self._enable_disable_join_buttons(True), self.status.setText("Proxy stopped. Ready.")))
-                break
-            await asyncio.sleep(0.5)
-
     def _enable_disable_join_buttons(self, enable: bool):
-        for i in range(self.grid.count()):
-            w = self.grid.itemAt(i).widget()
-            if isinstance(w, PlaceCard):
-                for child in w.findChildren(QPushButton):
-                    if child.text().startswith("Join"):
-                        child.setEnabled(enable)
+        self.results.set_join_enabled(enable)
 
     # ---------- Launch & helpers ----------
-    def launch_roblox(self, place_id):
-        roblox_url = f"roblox://experiences/start?placeId={place_id}"
-        system = platform.system()
-        try:
-            if system == "Windows":
-                os.startfile(roblox_url)
-            elif system == "Darwin":
-                subprocess.run(["open", roblox_url], check=False)
-            else:
-                subprocess.run(["xdg-open", roblox_url], check=False)
-        except Exception:
-            webbrowser.open(roblox_url)
-
     def open_in_browser(self, place_id):
         try:
             # Also record to recents when opening in browser
@@ -1236,36 +1388,44 @@ class Window(QMainWindow):
         except Exception:
             pass
 
-    # ---------- Cookie auto-read (Windows DPAPI) ----------
-    def get_roblosecurity(self):
-        path = os.path.expandvars(r"%LocalAppData%/Roblox/LocalStorage/RobloxCookies.dat")
-        try:
-            if not os.path.exists(path):
-                return None
-            with open(path, "r") as f:
-                data = json.load(f)
-            cookies_data = data.get("CookiesData")
-            if not cookies_data or not win32crypt:
-                return None
-            enc = base64.b64decode(cookies_data)
-            dec = win32crypt.CryptUnprotectData(enc, None, None, None, 0)[1]
-            s = dec.decode(errors="ignore")
-            m = re.search(r"\.ROBLOSECURITY\s+([^\s;]+)", s)
-            return m.group(1) if m else None
-        except Exception:
-            return None
-
     # ---------- Settings persistence ----------
     def _load_settings(self):
-        try:
-            d = json.loads(self.settings_path.read_text(encoding="utf-8"))
-        except Exception:
-            d = {}
+        d = self._settings.load()
         self.recent_ids = list(d.get("recent_ids", []))
         self.favorites = set(x for x in d.get("favorites", []) if str(x).isdigit())
         self._theme = d.get("theme", self._theme)
         self._text_color = d.get("text_color", self._text_color)
         self._btn_color = d.get("btn_color", self._btn_color)
+        try:
+            self.thumb_cache_mb = max(1, int(d.get("thumb_cache_mb", self.thumb_cache_mb)))
+        except Exception:
+            pass
+        self._thumb_disk.set_budget(self.thumb_cache_mb * 1024 * 1024)
+        try:
+            self.pixmap_cache_mb = max(4, int(d.get("pixmap_cache_mb", self.pixmap_cache_mb)))
+        except Exception:
+            pass
+        self._pixmaps.set_budget(self.pixmap_cache_mb * 1024 * 1024)
+        try:
+            self.search_cache_ttl = max(0, int(d.get("search_cache_ttl", self.search_cache_ttl)))
+        except Exception:
+            pass
+        self._search_cache.ttl = self.search_cache_ttl; self._thumbs.disk_fresh = self.search_cache_ttl
+        try:
+            self.prefetch_budget = max(0, int(d.get("prefetch_budget", self.prefetch_budget)))
+            self.prefetch_recents = max(0, int(d.get("prefetch_recents", self.prefetch_recents)))
+        except Exception:
+            pass
+        self._prefetch.set_budget(self.prefetch_budget)
+        self.keep_proxy_warm = bool(d.get("keep_proxy_warm", self.keep_proxy_warm))
+        self.log_level = str(d.get("log_level", self.log_level)).upper()
+        self.log_debug = [x for x in d.get("log_debug", self.log_debug) if isinstance(x, str)]
+        self.log_to_file = bool(d.get("log_to_file", self.log_to_file))
+        try:
+            setup_logging(self.log_level, debug=self.log_debug,
+                          log_file=self.settings_path.parent / "hopr.log" if self.log_to_file else None)
+        except Exception as e:
+            _log_ui.warning("bad logging settings: %s", e)
         if d.get("save_settings", True):
             self.save_settings_chk.setChecked(True)
         self._apply_theme(self._theme); self._apply_styles()
@@ -1274,6 +1434,15 @@ class Window(QMainWindow):
         d = {
             "recent_ids": self.recent_ids[:200],
             "favorites": sorted(self.favorites, key=lambda x:int(x)),
+            "thumb_cache_mb": self.thumb_cache_mb,
+            "pixmap_cache_mb": self.pixmap_cache_mb,
+            "search_cache_ttl": self.search_cache_ttl,
+            "prefetch_budget": self.prefetch_budget,
+            "prefetch_recents": self.prefetch_recents,
+            "keep_proxy_warm": self.keep_proxy_warm,
+            "log_level": self.log_level,
+            "log_debug": self.log_debug,
+            "log_to_file": self.log_to_file,
         }
         if self.save_settings_chk.isChecked() or force:
             d.update({
@@ -1282,31 +1451,52 @@ class Window(QMainWindow):
                 "btn_color": self._btn_color,
                 "save_settings": self.save_settings_chk.isChecked(),
             })
+        self._settings.save(d)
+
+    # ---------- Misc ----------
+    def showEvent(self, e):
+        super().showEvent(e)
+        if self._preload is None:
+            self._preload = preload_optional(("PIL.ImageDraw", "psutil", "win32crypt", "mitmproxy"))
+            if self.keep_proxy_warm:
+                threading.Thread(target=self.engine.proxy_daemon, name="proxy-warmup", daemon=True).start()
+    def closeEvent(self, event):
         try:
-            self.settings_path.parent.mkdir(parents=True, exist_ok=True)
-            self.settings_path.write_text(json.dumps(d, indent=2), encoding="utf-8")
+            self._jobs.cancel(); self._prefetch.stop()
+            self._settings.flush(); self._thumb_disk.flush(); self._search_cache.flush()
+            self.engine.stop_proxy_daemon()
         except Exception:
             pass
-
-    # ---------- Misc ----------
+        super().closeEvent(event)
     def _set_error(self, text):
         self.error_lbl.setText(text)
     def _on_main(self, fn):
-        inv = getattr(self, '_invoker', None)
-        if inv is not None:
-            print('[DEBUG] _on_main: queuing UI work via signal')
-            inv.call.emit(fn)
+        disp = getattr(self, '_dispatch', None)
+        if disp is not None:
+            disp.post(fn)
             return
-        print('[DEBUG] _on_main: fallback QTimer.singleShot')
+        _log_ui.debug("_on_main: fallback QTimer.singleShot")
         try:
             QTimer.singleShot(0, fn)
-        except Exception as e:
-            import traceback
-            print('[DEBUG] _on_main fallback failed:', e)
-            traceback.print_exc()
+        except Exception:
+            _log_ui.exception("_on_main fallback failed")
+
+def _report_startup(w):
+    """Prints STARTUP, then the background preload times once they are in."""
+    for k, v in STARTUP.items():
+        print(f"[STARTUP] {k:<20} {v*1000:8.1f} ms")
+    def wait_preload():
+        if w._preload is not None: w._preload.join()
+        for k, v in IMPORT_TIMES.items():
+            print(f"[STARTUP] preload {k:<12} {v*1000:8.1f} ms (background)")
+    threading.Thread(target=wait_preload, daemon=True).start()
 
 if __name__ == "__main__":
+    profile = "--profile-startup" in sys.argv
+    if profile: sys.argv.remove("--profile-startup")
     _safe_set_dpi_policy()
-    app = QApplication(sys.argv)
-    w = Window(); w.show()
+    t = time.perf_counter(); app = QApplication(sys.argv); STARTUP["QApplication"] = time.perf_counter() - t
+    t = time.perf_counter(); w = Window(); w.show(); STARTUP["Window"] = time.perf_counter() - t
+    if profile:
+        QTimer.singleShot(0, lambda: (STARTUP.__setitem__("total to event loop", time.perf_counter() - _T0), _report_startup(w)))
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""Shared setup for the benchmark scripts: offscreen Qt, a throwaway profile, quiet logs and a timer."""
+import os, sys, tempfile, time
+from pathlib import Path
+
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="hopr-bench-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hopr_core
+hopr_core.setup_logging("WARNING")  # measure the code, not stderr
+
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+def per_call(fn, n, clock=time.perf_counter):
+    """Average seconds per `fn(i)` over n calls."""
+    t = clock()
+    for i in range(n):
+        fn(i)
+    return (clock() - t) / n
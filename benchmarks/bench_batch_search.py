@@ -0,0 +1,39 @@
+"""Many place IDs: one-by-one HoprEngine.search() vs. search_many() against a slow local mock API.
+
+    python benchmarks/bench_batch_search.py [--ids 40] [--universes 10] [--pages 3] [--delay 0.08]
+
+Every request to the mock sleeps `--delay`; each universe has `--pages` pages of 100 places.
+Listings are fetched with use_cache=False and without timestamps, so both runs do the same work.
+"""
+import argparse, tempfile, time
+from pathlib import Path
+
+import _util  # noqa: F401  (path + throwaway profile)
+import hopr_core
+from tests.mock_roblox import ToLocal, serve
+
+def run(srv, fn):
+    srv.hits.clear(); t = time.perf_counter(); out = fn()
+    return time.perf_counter() - t, sum(srv.hits.values()), out
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("--ids", type=int, default=40); ap.add_argument("--universes", type=int, default=10)
+    ap.add_argument("--pages", type=int, default=3); ap.add_argument("--delay", type=float, default=0.08)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args()
+    srv = serve(args.delay, pages=args.pages, page_size=100, universe_of=lambda pid: (pid % args.universes + 1) * 10)
+    hopr_core.HTTP.session.mount("https://", ToLocal(srv.base))
+    ids = [str(10**6 + i) for i in range(args.ids)]
+    print(f"{args.ids} place IDs across {args.universes} universes, {args.pages} pages of 100 each, "
+          f"{args.delay * 1e3:.0f} ms per request")
+    engine = hopr_core.HoprEngine(Path(tempfile.mkdtemp()))
+    wall, hits, out = run(srv, lambda: [engine.search(p, timestamps=False, use_cache=False) for p in ids])
+    print(f"  one-by-one search(): {wall:6.2f} s, {hits:4d} requests, {sum(len(r['places']) for r in out)} places")
+    engine = hopr_core.HoprEngine(Path(tempfile.mkdtemp()))
+    wall, hits, (groups, errors) = run(srv, lambda: engine.search_many(ids, timestamps=False, use_cache=False, workers=args.workers))
+    print(f"  search_many():       {wall:6.2f} s, {hits:4d} requests, {len(groups)} groups, "
+          f"{sum(len(g['places']) for g in groups)} places, {len(errors)} errors")
+    srv.shutdown(); srv.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Replays request flows through JoinGameInterceptor and the pre-filtering addon it replaced.
+
+    python benchmarks/bench_interceptor.py [--count 20000] [--flows flows.jsonl] [--save flows.jsonl]
+
+Flows are stubs with the attributes the addon touches on mitmproxy's Request. Without --flows a
+seeded mix is generated: telemetry/asset/CDN traffic plus ~14% gamejoin calls, most of which
+already carry isTeleport and gameJoinAttemptId. --flows replays a recording (one JSON object per
+line: host, path, content_type, body), --save writes the generated mix in that format.
+"""
+import argparse, json, random, time, uuid
+
+import _util  # noqa: F401  (path)
+import hopr_core
+
+class StubRequest:
+    scheme = "https"; port = 443
+    def __init__(self, host, path, body, content_type="application/json"):
+        self.host = host; self.path = path; self.headers = {"Content-Type": content_type}
+        self._text = json.dumps(body) if body is not None else ""; self.sets = 0
+    @property
+    def pretty_url(self):  # mitmproxy assembles this on every access, too
+        return f"{self.scheme}://{self.host}{'' if self.port == 443 else ':' + str(self.port)}{self.path}"
+    def json(self):
+        return json.loads(self._text)
+    def set_text(self, text):
+        self._text = text; self.sets += 1
+
+class StubFlow:
+    def __init__(self, request): self.request = request
+
+class LegacyInterceptor:
+    """The addon before the host/path fast path: substring match on the full URL, always re-serialize."""
+    WANTED = ("/v1/join-game", "/v1/join-game-instance", "/v1/join-play-together-game", "/v1/join-play-together-game-instance")
+    def request(self, flow):
+        url = flow.request.pretty_url
+        if any(p in url for p in self.WANTED):
+            if "application/json" in flow.request.headers.get("Content-Type", "").lower():
+                try:
+                    body = flow.request.json()
+                except Exception:
+                    return
+                if "isTeleport" not in body: body["isTeleport"] = True
+                body.setdefault("gameJoinAttemptId", str(uuid.uuid4()))
+                flow.request.set_text(json.dumps(body))
+
+def synthetic(count, seed=1):
+    rnd = random.Random(seed)
+    hosts = ["ecsv2.roblox.com", "assetdelivery.roblox.com", "apis.roblox.com", "client-telemetry.roblox.com",
+             "gamejoin.roblox.com", "ephemeralcounters.api.roblox.com", "c0.rbxcdn.com"]
+    full = {"placeId": 1, "isTeleport": True, "gameJoinAttemptId": "x", "browserTrackerId": 0, "isPlayTogetherGame": False}
+    for i in range(count):
+        host = rnd.choice(hosts)
+        if host == "gamejoin.roblox.com":
+            path = rnd.choice(["/v1/join-game", "/v1/join-game-instance", "/v1/join-game", "/v1/queue"])
+            body = dict(full) if rnd.random() < 0.7 else {"placeId": 1}
+        else:
+            path = f"/v1/events/{rnd.randint(0, 99999)}?s={i}"; body = {"e": i}
+        yield {"host": host, "path": path, "content_type": "application/json", "body": body}
+
+def replay(addon, recorded):
+    flows = [StubFlow(StubRequest(r["host"], r["path"], r.get("body"), r.get("content_type", "application/json"))) for r in recorded]
+    t = time.perf_counter()
+    for f in flows:
+        addon.request(f)
+    return (time.perf_counter() - t) / len(flows) * 1e6, sum(f.request.sets for f in flows)
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("--count", type=int, default=20000)
+    ap.add_argument("--flows"); ap.add_argument("--save"); ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    if args.flows:
+        with open(args.flows, encoding="utf-8") as f:
+            recorded = [json.loads(line) for line in f if line.strip()]
+    else:
+        recorded = list(synthetic(args.count))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in recorded)
+    print(f"{len(recorded)} flows, best of {args.repeat}")
+    for name, make in (("legacy", LegacyInterceptor), ("JoinGameInterceptor", lambda: hopr_core.JoinGameInterceptor(armed=True))):
+        us, rewrites = min(replay(make(), recorded) for _ in range(args.repeat))
+        print(f"  {name:<20} {us:6.2f} us/flow, {rewrites} bodies rewritten")
+    addon = hopr_core.JoinGameInterceptor(armed=True); replay(addon, recorded)
+    print("  counters:", addon.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Cost of one reflow pass for the chip rows and the results grid with many items.
+
+    python benchmarks/bench_resize.py [--items 1000]
+"""
+import argparse
+
+import _util
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("--items", type=int, default=1000); ap.add_argument("-n", type=int, default=50)
+    args = ap.parse_args()
+    app = _util.qapp()
+    import Hopr
+    from PySide6.QtCore import QRect
+    Hopr.ThumbnailPipeline.request = lambda self, ids: None  # layout only, no network
+    w = Hopr.Window(); w.show(); app.processEvents()
+    w.display_results([{"id": i, "name": f"Place {i}"} for i in range(1, args.items + 1)])
+    w.rec_flow.set_labels([str(10**9 + i) for i in range(args.items)]); app.processEvents()
+    fl = w.rec_flow.flow; r = fl.geometry(); g = w.results
+    rows = [
+        ("chips, width change", lambda k: (fl.setGeometry(QRect(r.x(), r.y(), r.width() + (k % 2) * 4, r.height())), fl._apply())),
+        ("chips, same geometry", lambda k: (fl.setGeometry(QRect(r)), fl._apply())),
+        ("results, width change", lambda k: (g.resize(g.width() + (1 if k % 2 else -1), g.height()), g.relayout())),
+        ("results, no change", lambda k: g.relayout()),
+    ]
+    print(f"{args.items} chips + {args.items} results, ms per pass")
+    for label, fn in rows:
+        print(f"  {label:<24} {_util.per_call(fn, args.n) * 1e3:8.3f}")
+    def storm(k):
+        for j in range(4): w.resize(1000 + (k % 15) * 20 + j * 3, 820)
+        app.processEvents()
+    print(f"  {'window resize, 4/frame':<24} {_util.per_call(storm, 30) * 1e3:8.3f}  (per frame)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Cost of SearchCache writes on the resolve path with a large cache file.
+
+    python benchmarks/bench_search_cache.py [--universes 30] [--places 1000]
+"""
+import argparse, tempfile, time
+from pathlib import Path
+
+import _util  # noqa: F401  (path + throwaway profile)
+import hopr_core
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("--universes", type=int, default=30)
+    ap.add_argument("--places", type=int, default=1000); ap.add_argument("-n", type=int, default=40)
+    args = ap.parse_args()
+    path = Path(tempfile.mkdtemp()) / "search_cache.json"
+    cache = hopr_core.SearchCache(path, max_listings=max(40, args.universes))
+    for u in range(args.universes):
+        cache.store_listing(1000 + u, u * 10**6, [{"id": u * 10**6 + i, "name": f"Place {i}", "created": "2020-01-01T00:00:00Z",
+                                                    "updated": "2021-01-01T00:00:00Z"} for i in range(args.places)])
+    cache.flush()
+    print(f"cache file {path.stat().st_size / 1e6:.1f} MB, {args.universes} listings")
+    writes = cache.writes
+    per = _util.per_call(lambda i: cache.store_universe(5 * 10**8 + i, 7), args.n)
+    t = time.perf_counter(); cache.flush(); fl = time.perf_counter() - t
+    print(f"store_universe: {per * 1e3:.3f} ms per call on the caller's thread ({args.n} calls)")
+    print(f"file writes for the burst: {cache.writes - writes} (flush {fl * 1e3:.0f} ms, off the resolve path)")
+
+if __name__ == "__main__":
+    main()
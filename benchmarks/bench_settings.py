@@ -0,0 +1,41 @@
+"""UI-thread time spent persisting settings, debounced SettingsStore vs. the old inline write.
+
+    python benchmarks/bench_settings.py [-n 300] [--recents 200] [--favorites 300]
+"""
+import argparse, json
+
+import _util
+
+class InlineStore:
+    """What _save_settings used to do: serialize and rewrite settings.json on the calling thread."""
+    def __init__(self, path):
+        self.path = path; self.saves = 0; self.writes = 0
+    def save(self, d):
+        self.saves += 1
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(d, indent=2), encoding="utf-8"); self.writes += 1
+        except Exception:
+            pass
+    def flush(self):
+        pass
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("-n", type=int, default=300)
+    ap.add_argument("--recents", type=int, default=200); ap.add_argument("--favorites", type=int, default=300)
+    args = ap.parse_args()
+    _util.qapp()
+    import Hopr
+    w = Hopr.Window()
+    w.recent_ids = [str(100000 + i) for i in range(args.recents)]; w.favorites = {str(1000 + i) for i in range(args.favorites)}
+    store = w._settings; store.flush()
+    for name, s in (("inline write", InlineStore(w.settings_path)), ("SettingsStore", store)):
+        w._settings = s; saves, writes = s.saves, s.writes
+        per = _util.per_call(lambda i: w._save_settings(force=True), args.n)
+        s.flush()
+        print(f"{name:14s} {per * 1e3:7.3f} ms UI thread per save, {s.writes - writes} file writes for {s.saves - saves} saves")
+    d = json.loads(w.settings_path.read_text(encoding="utf-8"))
+    print(f"settings.json: {len(d['recent_ids'])} recents, {len(d['favorites'])} favorites")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""CPU time per thumbnail: decode + round (_round_thumb), PIL -> QImage, PixmapCache.put_source.
+
+    python benchmarks/bench_thumbs.py [-n 60] [--px 512]
+
+Uses process_time, so only this process's CPU counts. Also times the old PIL.ImageQt + QImage.copy()
+conversion on the same images.
+"""
+import argparse, io, random, time
+
+import _util
+
+def icon(fmt, px, seed=0):
+    """Synthetic opaque game icon, like the 512 px PNG/JPEG ones Roblox serves; "PNG-P" is a palette PNG."""
+    from PIL import Image, ImageDraw
+    rnd = random.Random(seed); im = Image.new("RGB", (px, px)); d = ImageDraw.Draw(im)
+    for _ in range(300):
+        x0, y0 = rnd.randint(0, px // 2), rnd.randint(0, px // 2)
+        d.ellipse((x0, y0, rnd.randint(x0, px), rnd.randint(y0, px)), fill=tuple(rnd.randint(0, 255) for _ in range(3)))
+    if fmt == "PNG-P":
+        fmt, im = "PNG", im.quantize(256)
+    b = io.BytesIO(); im.save(b, format=fmt); return b.getvalue()
+
+def legacy_to_qimage(pil_img):
+    from PIL.ImageQt import ImageQt
+    from PySide6.QtGui import QImage
+    return QImage(ImageQt(pil_img)).copy()
+
+def main():
+    ap = argparse.ArgumentParser(); ap.add_argument("-n", type=int, default=60); ap.add_argument("--px", type=int, default=512)
+    args = ap.parse_args()
+    _util.qapp()
+    import Hopr, hopr_core
+    to_qimage = Hopr.Window._pil_to_qimage
+    for fmt in ("PNG", "PNG-P", "JPEG"):
+        raw = icon(fmt, args.px); cache = Hopr.PixmapCache(budget=1 << 40)
+        imgs = [hopr_core._round_thumb(raw) for _ in range(2)]  # warm up decoders
+        rnd = _util.per_call(lambda i: hopr_core._round_thumb(raw), args.n, time.process_time)
+        conv = _util.per_call(lambda i: to_qimage(imgs[0]), args.n, time.process_time)
+        old = _util.per_call(lambda i: legacy_to_qimage(imgs[0]), args.n, time.process_time)
+        total = _util.per_call(lambda i: cache.put_source(i, to_qimage(hopr_core._round_thumb(raw))), args.n, time.process_time)
+        print(f"{fmt:5s} {len(raw) / 1024:4.0f} KB: round {rnd * 1e3:5.2f} ms, to QImage {conv * 1e3:5.3f} ms "
+              f"(ImageQt+copy {old * 1e3:5.3f} ms), end to end {total * 1e3:5.2f} ms CPU per thumbnail")
+
+if __name__ == "__main__":
+    main()
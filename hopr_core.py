@@ -0,0 +1,1926 @@
+# hopr_core.py
+# GUI-free core of Hopr: Roblox API access, caches, join pre-seed and proxy flow.
+# Hopr.py builds the Qt UI on top of this; it also runs headless:
+#   python hopr_core.py search <placeId> [...] --json
+#   python hopr_core.py join <placeId>
+
+import time
+import sys, os, json, uuid, threading, platform, webbrowser, subprocess, base64, re, stat, random, argparse
+import importlib, types, hashlib, functools, logging, logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from pathlib import Path
+from io import BytesIO
+
+# --- ensure Requests ignores system proxies to avoid hangs ---
+
+import requests
+from urllib3.util.retry import Retry
+
+# ---------- Optional / heavy dependencies ----------
+# mitmproxy, psutil, win32crypt and PIL are imported on first use rather than at startup;
+# preload_optional() warms them on a background thread once the UI is up.
+_OPTIONAL = {}
+_OPTIONAL_LOCK = threading.Lock()
+IMPORT_TIMES = {}
+
+def _load_mitmproxy():
+    from mitmproxy import http  # type: ignore
+    from mitmproxy.options import Options  # type: ignore
+    from mitmproxy.tools.dump import DumpMaster  # type: ignore
+    return types.SimpleNamespace(http=http, Options=Options, DumpMaster=DumpMaster)
+
+_OPTIONAL_LOADERS = {"mitmproxy": _load_mitmproxy}
+
+def optional(name):
+    """The module for an optional dependency (a namespace for mitmproxy), or None if unavailable."""
+    if name in _OPTIONAL: return _OPTIONAL[name]
+    with _OPTIONAL_LOCK:
+        if name not in _OPTIONAL:
+            t0 = time.perf_counter()
+            try:
+                _OPTIONAL[name] = _OPTIONAL_LOADERS.get(name, lambda: importlib.import_module(name))()
+            except Exception:
+                _OPTIONAL[name] = None
+            IMPORT_TIMES[name] = time.perf_counter() - t0
+        return _OPTIONAL[name]
+
+def proxy_available():
+    return optional("mitmproxy") is not None and optional("psutil") is not None
+
+def preload_optional(names=("PIL.ImageDraw", "psutil", "win32crypt", "mitmproxy")):
+    """Imports `names` on a daemon thread; returns the thread."""
+    t = threading.Thread(target=lambda: [optional(n) for n in names], name="preload", daemon=True)
+    t.start(); return t
+
+# ---------- Logging ----------
+# One logger per subsystem under "hopr" (hopr.http, hopr.ui, hopr.proxy, ...). Messages use lazy %-formatting,
+# so disabled DEBUG calls cost a level check; setup_logging() picks the levels and the optional file sink.
+SUBSYSTEMS = ("http", "ui", "search", "thumb", "cache", "proxy", "join")
+_LOG_FORMAT = "%(asctime)s %(levelname)-5s [%(name)s] %(message)s"
+
+def logger(subsystem):
+    return logging.getLogger(f"hopr.{subsystem}")
+
+def setup_logging(level="INFO", debug=(), quiet=(), log_file=None, max_bytes=2*1024*1024, backups=3):
+    """(Re)configures the "hopr" loggers: `debug`/`quiet` subsystems go to DEBUG/WARNING, the rest to `level`.
+
+    Logs go to stderr (when there is one), plus a rotating file when `log_file` is set. Safe to call again to change settings.
+    """
+    root = logging.getLogger("hopr"); root.propagate = False
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    for h in list(root.handlers):
+        root.removeHandler(h); h.close()
+    fmt = logging.Formatter(_LOG_FORMAT, "%H:%M:%S")
+    if sys.stderr is not None:  # windowed builds have no console
+        console = logging.StreamHandler(sys.stderr); console.setFormatter(fmt); root.addHandler(console)
+    if log_file:
+        try:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            fh = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+            fh.setFormatter(logging.Formatter(_LOG_FORMAT)); root.addHandler(fh)
+        except Exception as e:
+            root.warning("log file %s unavailable: %s", log_file, e)
+    for sub in SUBSYSTEMS:
+        lg = logger(sub)
+        lg.setLevel(logging.DEBUG if sub in debug else logging.WARNING if sub in quiet else logging.NOTSET)
+    return root
+
+setup_logging()
+_log_http = logger("http"); _log_search = logger("search"); _log_thumb = logger("thumb"); _log_cache = logger("cache")
+_log_proxy = logger("proxy"); _log_join = logger("join")
+
+DATA_DIR = Path.home() / "AppData/Local/SubplaceJoiner"
+
+# ==================== Network helpers ====================
+
+ECONOMY_DETAILS_URL = "https://economy.roblox.com/v2/assets/{pid}/details"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class _TimedAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that applies the default timeout and feeds per-host latency counters."""
+    def __init__(self, client, **kw):
+        self._client = client
+        super().__init__(**kw)
+    def send(self, request, **kw):
+        if kw.get("timeout") is None:
+            kw["timeout"] = self._client.timeout
+        host = urlsplit(request.url).hostname or "?"; t0 = time.perf_counter()
+        try:
+            r = super().send(request, **kw)
+        except Exception:
+            self._client._record(host, time.perf_counter() - t0, error=True); raise
+        self._client._record(host, time.perf_counter() - t0)
+        return r
+
+class HttpClient:
+    """The one HTTP layer for Roblox API traffic: keep-alive pools per host, one timeout/retry policy.
+
+    Every session handed out (`session`, `new_session()`) mounts the same adapter, so connections
+    are reused across searches, thumbnails, timestamps and joins. System proxies are ignored
+    (`trust_env=False`) so the mitm proxy never sees our own calls. requests/urllib3 speak
+    HTTP/1.1 only; reuse comes from the pools. `stats()` reports per-host latency and how many
+    connections were actually opened.
+    """
+    def __init__(self, pool_hosts=12, pool_size=16, timeout=(5, 10), retries=2):
+        self.timeout = timeout
+        self._lock = threading.Lock(); self._stats = {}
+        # Connection-level retries only; HTTP status handling (429, 5xx) stays with the callers
+        retry = Retry(total=retries, connect=retries, read=retries, status=0, backoff_factor=0.3,
+                      allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+        self.adapter = _TimedAdapter(self, pool_connections=pool_hosts, pool_maxsize=pool_size, max_retries=retry)
+        self.session = self.new_session()
+
+    def new_session(self, headers=None):
+        sess = requests.Session()
+        sess.trust_env = False
+        sess.proxies = {}
+        sess.mount("https://", self.adapter); sess.mount("http://", self.adapter)
+        if headers:
+            sess.headers.update(headers)
+        return sess
+
+    def get(self, url, **kw):
+        return self.session.get(url, **kw)
+
+    def post(self, url, **kw):
+        return self.session.post(url, **kw)
+
+    def _record(self, host, seconds, error=False):
+        with self._lock:
+            st = self._stats.setdefault(host, {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            st["requests"] += 1; st["errors"] += int(error)
+            ms = seconds * 1000.0; st["total_ms"] += ms; st["max_ms"] = max(st["max_ms"], ms)
+
+    def stats(self):
+        """host -> requests, errors, avg_ms, max_ms, connections (opened by the live pool)."""
+        conns = {}
+        try:
+            pools = self.adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    conns[pool.host] = conns.get(pool.host, 0) + pool.num_connections
+        except Exception:
+            pass
+        with self._lock:
+            return {host: {"requests": st["requests"], "errors": st["errors"],
+                           "avg_ms": round(st["total_ms"] / max(1, st["requests"]), 1),
+                           "max_ms": round(st["max_ms"], 1), "connections": conns.get(host)}
+                    for host, st in self._stats.items()}
+
+    def summary(self):
+        return "; ".join(f"{h}: {s['requests']} req/{s['connections']} conn, avg {s['avg_ms']} ms"
+                         for h, s in sorted(self.stats().items()))
+
+HTTP = HttpClient()
+
+def _parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date; returns seconds or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+        return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/s, bursts up to `capacity`."""
+    def __init__(self, rate=8.0, capacity=8):
+        self.rate = float(rate); self.capacity = float(capacity)
+        self._tokens = float(capacity); self._stamp = time.monotonic(); self._resume_at = 0.0
+        self._lock = threading.Lock()
+    def pause(self, seconds: float):
+        # Server told us to back off (Retry-After) — hold every caller, not just the one that got throttled
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds); self._tokens = 0.0
+    def acquire(self, cancel: threading.Event|None=None) -> bool:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._resume_at:
+                    self._tokens = min(self.capacity, self._tokens + (now - max(self._stamp, self._resume_at)) * self.rate)
+                    self._stamp = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1; return True
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._resume_at - now
+            if cancel is None:
+                time.sleep(wait)
+            elif cancel.wait(wait):
+                return False
+
+class TimestampLoader:
+    """Fetches Created/Updated for places on a bounded pool sharing one keep-alive session.
+
+    Requests go through a TokenBucket; 429/5xx and connection errors are retried with
+    full-jitter exponential backoff (or the server's Retry-After) up to `max_retries`.
+    Finished places are handed to `on_batch` in groups of `batch_size`. `cancel()` drops
+    queued work and suppresses any further callbacks.
+    """
+    def __init__(self, cookie="", on_batch=None, workers=6, rate=8.0, burst=8, max_retries=5,
+                 base_delay=0.5, max_delay=20.0, batch_size=5, timeout=10,
+                 url_template=ECONOMY_DETAILS_URL, session=None):
+        self.cookie = cookie or ""; self.on_batch = on_batch
+        self.max_retries = int(max_retries); self.base_delay = float(base_delay); self.max_delay = float(max_delay)
+        self.batch_size = max(1, int(batch_size)); self.timeout = timeout; self.url_template = url_template
+        self._session = session or HTTP.session
+        self._bucket = TokenBucket(rate, burst)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="timestamps")
+        self._cancel = threading.Event()
+        self._lock = threading.Lock(); self._pending = []; self._outstanding = 0
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def submit(self, places):
+        if self.cancelled: return
+        places = list(places)
+        with self._lock:
+            self._outstanding += len(places)
+        for p in places:
+            self._pool.submit(self._fetch, p)
+
+    def close(self, wait=False):
+        """No more submits; workers exit once the queue drains (`wait` blocks until then)."""
+        self._pool.shutdown(wait=wait)
+
+    def cancel(self):
+        self._cancel.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, p):
+        pid = p.get("id"); url = self.url_template.format(pid=pid)
+        cookies = {".ROBLOSECURITY": self.cookie} if self.cookie else None
+        attempt = 0
+        while not self.cancelled:
+            if not self._bucket.acquire(self._cancel):
+                return
+            retry_after = None
+            try:
+                r = self._session.get(url, cookies=cookies, timeout=self.timeout)
+            except requests.RequestException as err:
+                _log_http.warning("could not fetch asset details for %s: %s", pid, err)
+            else:
+                if r.status_code == 200:
+                    try:
+                        asset_data = r.json()
+                        p["created"] = asset_data.get("Created")
+                        p["updated"] = asset_data.get("Updated")
+                        _log_http.debug("place %s: created=%s updated=%s", pid, p["created"], p["updated"])
+                    except Exception as perr:
+                        _log_http.warning("bad asset details for %s: %s", pid, perr)
+                    break
+                if r.status_code not in RETRY_STATUSES:
+                    _log_http.warning("HTTP %s on asset details for %s", r.status_code, pid)
+                    break
+                retry_after = _parse_retry_after(r.headers.get("Retry-After"))
+                _log_http.info("rate-limited or server error on %s (HTTP %s)", pid, r.status_code)
+            attempt += 1
+            if attempt > self.max_retries:
+                _log_http.warning("giving up on %s after %s retries", pid, self.max_retries)
+                break
+            if retry_after is not None:
+                delay = retry_after; self._bucket.pause(retry_after)
+            else:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+            if self._cancel.wait(delay):
+                return
+        if not self.cancelled:
+            self._done(p)
+
+    def _done(self, p):
+        with self._lock:
+            self._pending.append(p); self._outstanding -= 1
+            if len(self._pending) < self.batch_size and self._outstanding > 0:
+                return
+            batch, self._pending = self._pending, []
+        if self.on_batch and not self.cancelled:
+            self.on_batch(batch)
+
+class ThumbDiskCache:
+    """Processed (rounded) icons on disk, keyed by place ID + image URL, evicted LRU past `budget` bytes.
+
+    `index.json` records size, last use and the ETag/Last-Modified validators of every PNG.
+    Entries older than `revalidate_after` seconds are re-checked with a conditional GET.
+    """
+    def __init__(self, root: Path, budget=64 * 1024 * 1024, revalidate_after=7 * 86400, save_interval=2.0):
+        self.root = Path(root); self.budget = int(budget); self.revalidate_after = revalidate_after
+        self.save_interval = save_interval
+        self._lock = threading.Lock(); self._dirty = False; self._saved_at = 0.0
+        try:
+            self._index = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+        except Exception:
+            self._index = {}
+        with self._lock:
+            self._evict_locked()
+
+    @staticmethod
+    def _key(place_id, url):
+        return f"{place_id}_{uuid.uuid5(uuid.NAMESPACE_URL, str(url)).hex[:16]}"
+
+    def get(self, place_id, url):
+        with self._lock:
+            entry = self._index.get(self._key(place_id, url))
+            if entry is None or not (self.root / entry["file"]).exists():
+                return None
+            entry["used"] = time.time(); self._dirty = True
+            return dict(entry)
+
+    def latest(self, place_id):
+        """Most recently stored entry for a place regardless of URL (offline fallback)."""
+        return self.latest_many([place_id]).get(place_id)
+
+    def latest_many(self, place_ids):
+        """{place_id: latest entry} for the ids that have one, in a single pass over the index."""
+        wanted = {str(pid): pid for pid in place_ids}; out = {}
+        with self._lock:
+            for e in self._index.values():
+                pid = wanted.get(str(e.get("place_id")))
+                if pid is not None and (pid not in out or e.get("stored", 0) > out[pid].get("stored", 0)):
+                    out[pid] = e
+        return {pid: dict(e) for pid, e in out.items()}
+
+    def stale(self, entry):
+        return time.time() - entry.get("validated", 0) > self.revalidate_after
+
+    def load(self, entry):
+        from PIL import Image
+        return Image.open(self.root / entry["file"]).convert("RGBA")
+
+    def put(self, place_id, url, img, etag=None, last_modified=None):
+        key = self._key(place_id, url); path = self.root / f"{key}.png"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp"); img.save(tmp, format="PNG"); os.replace(tmp, path)
+        except Exception as e:
+            _log_thumb.warning("disk cache write failed for %s: %s", place_id, e); return
+        now = time.time()
+        with self._lock:
+            self._index[key] = {"place_id": place_id, "url": url, "file": path.name, "size": path.stat().st_size,
+                                "etag": etag, "last_modified": last_modified, "stored": now, "used": now, "validated": now}
+            self._evict_locked(); self._dirty = True
+        self._maybe_save()
+
+    def mark_validated(self, place_id, url):
+        with self._lock:
+            entry = self._index.get(self._key(place_id, url))
+            if entry is not None:
+                entry["validated"] = time.time(); self._dirty = True
+
+    def set_budget(self, budget):
+        with self._lock:
+            self.budget = int(budget); self._evict_locked(); self._dirty = True
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e.get("size", 0) for e in self._index.values())
+
+    def _evict_locked(self):
+        total = sum(e.get("size", 0) for e in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1].get("used", 0)):
+            if total <= self.budget:
+                break
+            try:
+                (self.root / entry["file"]).unlink()
+            except OSError:
+                pass
+            total -= entry.get("size", 0); del self._index[key]
+
+    def _maybe_save(self):
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._index); self._dirty = False; self._saved_at = time.monotonic()
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / "index.json.tmp"; tmp.write_text(data, encoding="utf-8"); os.replace(tmp, self.root / "index.json")
+        except Exception as e:
+            _log_thumb.warning("disk cache index save failed: %s", e)
+
+class SettingsStore:
+    """settings.json persisted off the caller's thread.
+
+    `save(d)` only records the latest snapshot; a writer thread serializes it `delay` seconds after
+    the last call (bursts collapse into one write) and replaces the file atomically via a temp file.
+    `flush()` writes any pending snapshot now and waits out a write the writer thread has in flight,
+    so on close the last `save()` is on disk when it returns.
+    """
+    def __init__(self, path: Path, delay=0.4):
+        self.path = Path(path); self.delay = delay
+        self._cv = threading.Condition(); self._pending = None; self._due = 0.0; self._thread = None
+        self._io = threading.Lock(); self._written = 0
+        self.saves = 0; self.writes = 0
+
+    def load(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def save(self, data: dict):
+        with self._cv:
+            self.saves += 1; self._pending = (self.saves, data); self._due = time.monotonic() + self.delay
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._writer, name="settings-writer", daemon=True); self._thread.start()
+            self._cv.notify()
+
+    def flush(self, timeout=5.0):
+        with self._cv:
+            item, self._pending = self._pending, None; target = self.saves
+        if item is not None:
+            self._write(*item)
+        with self._cv:
+            return self._cv.wait_for(lambda: self._written >= target, timeout)
+
+    def _writer(self):
+        while True:
+            with self._cv:
+                while self._pending is None:
+                    if not self._cv.wait(timeout=30) and self._pending is None:
+                        self._thread = None; return
+                while self._pending is not None and time.monotonic() < self._due:
+                    self._cv.wait(timeout=max(0.0, self._due - time.monotonic()))
+                item, self._pending = self._pending, None
+            if item is not None:
+                self._write(*item)
+
+    def _write(self, seq, data):
+        with self._io:
+            if seq <= self._written:
+                return  # a newer snapshot already landed (flush raced the writer)
+            self._write_file(data); self._written = seq
+        with self._cv:
+            self._cv.notify_all()  # wakes flush() waiting on this write
+
+    def _write_file(self, data):
+        try:
+            text = json.dumps(data, indent=2)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp"); tmp.write_text(text, encoding="utf-8"); os.replace(tmp, self.path)
+            self.writes += 1
+        except Exception as e:
+            _log_cache.warning("settings save failed: %s", e)
+
+class SearchCache:
+    """Persisted universe resolution + subplace listings for stale-while-revalidate searches.
+
+    place -> universe never changes, so it is kept indefinitely; a listing (root place + places)
+    is "fresh" for `ttl` seconds, after which it is still served but should be refreshed.
+    Listings unused for `max_age` seconds, or least recently used past `max_listings`, are dropped
+    together with their subplace mappings. Changes are written by a background thread `delay`
+    seconds after the last one; `flush()` writes now (on close, and after timestamps are loaded,
+    since place dicts are shared with the UI).
+    """
+    def __init__(self, path: Path, ttl=3600, max_listings=40, max_age=14 * 86400, delay=2.0):
+        self.path = Path(path); self.ttl = ttl; self.max_listings = int(max_listings); self.max_age = max_age
+        self.delay = delay
+        self._lock = threading.Lock(); self._io = threading.Lock()
+        self._cv = threading.Condition(self._lock); self._dirty = False; self._due = 0.0; self._thread = None
+        self.writes = 0
+        try:
+            d = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            d = {}
+        self._universes = {str(k): v for k, v in d.get("universe_of", {}).items()}
+        self._listings = {str(k): v for k, v in d.get("listings", {}).items()}
+        with self._lock:
+            self._prune_locked()
+
+    def universe_for(self, place_id):
+        with self._lock:
+            return self._universes.get(str(place_id))
+
+    def store_universe(self, place_id, universe_id):
+        with self._lock:
+            self._universes[str(place_id)] = universe_id
+            self._changed_locked()
+
+    def listing(self, universe_id):
+        """(root_place_id, places, fresh) or None."""
+        with self._lock:
+            entry = self._listings.get(str(universe_id))
+            if not entry:
+                return None
+            entry["used"] = time.time()
+            fresh = time.time() - entry.get("fetched", 0) < self.ttl
+            return entry.get("root"), entry.get("places", []), fresh
+
+    def store_listing(self, universe_id, root_place_id, places):
+        with self._lock:
+            now = time.time()
+            self._listings[str(universe_id)] = {"root": root_place_id, "places": places, "fetched": now, "used": now}
+            for p in places:
+                if p.get("id") is not None:
+                    self._universes[str(p.get("id"))] = universe_id
+            self._prune_locked(); self._changed_locked()
+
+    def touch(self):
+        """Place dicts changed in place (timestamps came in): schedule a write."""
+        with self._lock:
+            self._changed_locked()
+
+    def _prune_locked(self):
+        now = time.time()
+        by_use = sorted(self._listings.items(), key=lambda kv: kv[1].get("used", kv[1].get("fetched", 0)), reverse=True)
+        drop = [k for i, (k, e) in enumerate(by_use)
+                if i >= self.max_listings or now - e.get("used", e.get("fetched", 0)) > self.max_age]
+        for key in drop:
+            entry = self._listings.pop(key)
+            for p in entry.get("places", []):
+                if str(self._universes.get(str(p.get("id")))) == key:
+                    del self._universes[str(p.get("id"))]
+        if drop:
+            _log_cache.debug("search cache: dropped %d listings", len(drop))
+
+    def _changed_locked(self):
+        self._dirty = True; self._due = time.monotonic() + self.delay
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="cache-writer", daemon=True); self._thread.start()
+        self._cv.notify()
+
+    def _writer(self):
+        while True:
+            with self._cv:
+                while not self._dirty or time.monotonic() < self._due:
+                    if not self._dirty:
+                        if not self._cv.wait(timeout=30) and not self._dirty:
+                            self._thread = None; return
+                    else:
+                        self._cv.wait(timeout=max(0.0, self._due - time.monotonic()))
+            self.flush()
+
+    def flush(self):
+        # One writer at a time, so concurrent flushes neither share the temp file nor let an older
+        # snapshot land after a newer one. Only the shallow copy happens under the lock.
+        with self._io:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                snapshot = {"universe_of": dict(self._universes), "listings": {k: dict(v) for k, v in self._listings.items()}}
+            try:
+                data = json.dumps(snapshot)
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp"); tmp.write_text(data, encoding="utf-8"); os.replace(tmp, self.path)
+                self.writes += 1
+            except Exception as e:
+                _log_cache.warning("search cache save failed: %s", e)
+
+class CaBundleIndex:
+    """Remembers which client version folders already trust the mitm CA, so warm joins skip the scan.
+
+    Per Versions dir we keep its mtime plus, per version folder, the folder mtime, the (mtime, size)
+    of its ssl/cacert.pem and the CA fingerprint that was installed. A Versions dir whose mtime is
+    unchanged and whose folders all carry the current fingerprint and an unchanged bundle is skipped
+    without being listed; inside a changed one, only folders whose own mtime or bundle moved (or
+    that trust an older CA) get their cacert.pem read. The bundle stat catches a bootstrapper
+    re-extracting cacert.pem in place, which leaves the folder mtimes alone.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path); self._lock = threading.Lock(); self._fp_key = None; self._fp = None
+        try:
+            self._dirs = json.loads(self.path.read_text(encoding="utf-8")).get("versions", {})
+        except Exception:
+            self._dirs = {}
+
+    def fingerprint(self, ca_path: Path):
+        """SHA-256 of the CA file (re-hashed only when its mtime/size change); None if it is missing."""
+        try:
+            st = ca_path.stat()
+        except OSError:
+            return None
+        key = (str(ca_path), st.st_mtime_ns, st.st_size)
+        if key != self._fp_key:
+            self._fp = hashlib.sha256(ca_path.read_bytes()).hexdigest(); self._fp_key = key
+        return self._fp
+
+    def trusted(self, versions_path: Path, fp):
+        entry = self._dirs.get(str(versions_path))
+        if not entry or not entry.get("folders"):
+            return False
+        try:
+            if versions_path.stat().st_mtime_ns != entry.get("mtime"):
+                return False
+        except OSError:
+            return False
+        return all(f.get("fp") == fp and f.get("ca") == self.bundle_stat(versions_path / name)
+                   for name, f in entry["folders"].items())
+
+    def folder_ok(self, versions_path: Path, folder: Path, fp):
+        f = self._dirs.get(str(versions_path), {}).get("folders", {}).get(folder.name)
+        try:
+            return (bool(f) and f.get("fp") == fp and folder.stat().st_mtime_ns == f.get("mtime")
+                    and f.get("ca") == self.bundle_stat(folder))
+        except OSError:
+            return False
+
+    @staticmethod
+    def bundle_stat(folder: Path):
+        """[mtime_ns, size] of the folder's ssl/cacert.pem (a list so it compares equal after a JSON round trip)."""
+        try:
+            st = (folder / "ssl" / "cacert.pem").stat()
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def record(self, versions_path: Path, mtime_ns, folders):
+        """`folders`: {name: {"mtime", "ca", "fp"}} for every client folder found in this pass."""
+        with self._lock:
+            self._dirs[str(versions_path)] = {"mtime": mtime_ns, "folders": folders}
+
+    def flush(self):
+        with self._lock:
+            data = json.dumps({"versions": self._dirs})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp"); tmp.write_text(data, encoding="utf-8"); os.replace(tmp, self.path)
+        except Exception as e:
+            _log_cache.warning("CA index save failed: %s", e)
+
+ROBLOX_COOKIES_PATH = Path(os.path.expandvars(r"%LocalAppData%/Roblox/LocalStorage/RobloxCookies.dat"))
+
+def dpapi_decrypt(blob: bytes):
+    """Windows DPAPI (win32crypt); None when it is not available."""
+    win32crypt = optional("win32crypt")
+    if not win32crypt:
+        return None
+    return win32crypt.CryptUnprotectData(blob, None, None, None, 0)[1]
+
+class CookieProvider:
+    """The .ROBLOSECURITY value from RobloxCookies.dat, decrypted once per version of the file.
+
+    The result (including "no cookie") is cached against the file's (mtime, size), so repeat
+    calls cost one stat(). `decrypt` maps the encrypted blob to bytes; it defaults to DPAPI and
+    can be swapped for a fake backend off Windows.
+    """
+    def __init__(self, path: Path|None=None, decrypt=None):
+        self.path = Path(path or ROBLOX_COOKIES_PATH); self.decrypt = decrypt or dpapi_decrypt
+        self._lock = threading.Lock(); self._key = self._STALE; self._value = None; self.loads = 0
+
+    _STALE = object()
+
+    def get(self):
+        try:
+            st = self.path.stat(); key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key == self._key:
+            return self._value
+        with self._lock:
+            if key != self._key:
+                self._value = self._load() if key else None; self._key = key; self.loads += 1
+            return self._value
+
+    def invalidate(self):
+        self._key = self._STALE
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8", errors="ignore"))
+            cookies_data = data.get("CookiesData")
+            if not cookies_data:
+                return None
+            dec = self.decrypt(base64.b64decode(cookies_data))
+            if not dec:
+                return None
+            m = re.search(r"\.ROBLOSECURITY\s+([^\s;]+)", dec.decode(errors="ignore"))
+            _log_join.debug("cookie file reloaded (%s)", "cookie found" if m else "no .ROBLOSECURITY")
+            return m.group(1) if m else None
+        except Exception as e:
+            _log_join.debug("cookie file unreadable: %s", e)
+            return None
+
+GAMEICONS_URL = "https://thumbnails.roblox.com/v1/places/gameicons"
+
+THUMB_PX = 256  # processed icon size; matches the UI's source pixmaps
+
+@functools.lru_cache(maxsize=8)
+def _rounded_mask(side: int):
+    """Rounded-corner alpha mask, built once per size and shared."""
+    from PIL import Image, ImageDraw
+    mask = Image.new("L", (side, side), 0); draw = ImageDraw.Draw(mask); draw.rounded_rectangle((0,0,side,side), radius=side//6, fill=255)
+    return mask
+
+def _round_thumb(data: bytes, px=THUMB_PX):
+    """Decodes an icon straight to at most `px` square (JPEG draft / box reduce) and rounds its corners."""
+    from PIL import Image
+    pil = Image.open(BytesIO(data))
+    pil.draft("RGB", (px, px))  # JPEG only: decode at 1/2..1/8 scale; no-op for PNG
+    if pil.mode not in ("RGB", "RGBA", "L", "LA"):
+        pil = pil.convert("RGBA")  # reduce() rejects palette, 1-bit and 16-bit images
+    factor = min(pil.width, pil.height) // px
+    if factor >= 2:
+        pil = pil.reduce(factor)  # integer box reduce: one cheap pass, e.g. 512 -> 256
+    side = min(px, pil.width, pil.height)
+    if pil.size != (side, side):
+        pil = pil.resize((side, side), Image.BILINEAR)
+    img = pil.convert("RGBA") if pil.mode != "RGBA" else pil
+    img.putalpha(_rounded_mask(side))
+    return img
+
+class ThumbnailPipeline:
+    """Resolves place icons through the multi-ID gameicons endpoint and downloads them on a fixed pool.
+
+    `request(ids)` queues place IDs; a single dispatcher thread coalesces them into lookups of
+    up to `batch_size` IDs, re-polls entries still "Pending", and hands image URLs to `workers`
+    download threads. With a `disk_cache`, known URLs are served from disk instead of downloaded, and
+    icons stored or revalidated within `disk_fresh` seconds skip the lookup as well.
+    `on_ready(place_id, image_or_None)` is called from a pool thread.
+    """
+    def __init__(self, on_ready, workers=4, batch_size=100, size="512x512", pending_retries=5,
+                 pending_delay=1.5, coalesce=0.05, timeout=10, url=GAMEICONS_URL, session=None, disk_cache=None,
+                 disk_fresh=3600):
+        self.on_ready = on_ready; self.disk_cache = disk_cache; self.batch_size = max(1, min(100, int(batch_size))); self.size = size
+        self.disk_fresh = disk_fresh
+        self.pending_retries = int(pending_retries); self.pending_delay = float(pending_delay)
+        self.coalesce = float(coalesce); self.timeout = timeout; self.url = url
+        self._session = session or HTTP.session
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self._cv = threading.Condition(); self._queued = []; self._pending = {}  # pid -> (due, attempts)
+        self._inflight = set(); self._thread = None; self._epoch = 0
+
+    def request(self, place_ids):
+        with self._cv:
+            for pid in place_ids:
+                if pid is None or pid in self._inflight:
+                    continue
+                self._inflight.add(pid); self._queued.append(pid)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="thumbs-dispatch", daemon=True)
+                self._thread.start()
+            self._cv.notify()
+
+    def clear(self):
+        """Forget queued/pending lookups; lookups and downloads already running finish without calling `on_ready`."""
+        with self._cv:
+            self._queued = []; self._pending = {}; self._inflight = set(); self._epoch += 1
+
+    def _dispatch(self):
+        while True:
+            with self._cv:
+                while True:
+                    now = time.monotonic()
+                    due = [pid for pid, (t, _) in self._pending.items() if t <= now]
+                    if self._queued or due:
+                        break
+                    nxt = min((t for t, _ in self._pending.values()), default=None)
+                    self._cv.wait(None if nxt is None else max(0.0, nxt - now))
+            # Let a burst of request() calls land in the same lookup
+            time.sleep(self.coalesce)
+            with self._cv:
+                now = time.monotonic()
+                due = [pid for pid, (t, _) in self._pending.items() if t <= now]
+                ids = due + self._queued; self._queued = []
+                attempts = {pid: self._pending.pop(pid)[1] for pid in due}; epoch = self._epoch
+            if self.disk_cache is not None and self.disk_fresh and ids:
+                known = self.disk_cache.latest_many(ids); now = time.time()
+                hits = {pid for pid, e in known.items() if now - e.get("validated", 0) < self.disk_fresh}
+                for pid in hits:
+                    self._pool.submit(self._from_disk, pid, known[pid], epoch)
+                ids = [pid for pid in ids if pid not in hits]
+            for i in range(0, len(ids), self.batch_size):
+                if epoch != self._epoch:
+                    break
+                self._lookup(ids[i:i + self.batch_size], attempts, epoch)
+
+    def warm(self, place_ids, spend=None):
+        """Stores icons for `place_ids` in the disk cache without calling `on_ready` (blocking).
+
+        Places that already have an entry are skipped. `spend()` runs before every request and may
+        raise to abort. Returns the number of icons downloaded.
+        """
+        if self.disk_cache is None:
+            return 0
+        known = self.disk_cache.latest_many(place_ids)
+        ids = [pid for pid in place_ids if pid is not None and pid not in known]
+        stored = 0
+        for i in range(0, len(ids), self.batch_size):
+            if spend: spend()
+            r = self._session.get(self.url, params={"placeIds": ",".join(str(p) for p in ids[i:i + self.batch_size]),
+                                                    "size": self.size, "format": "Png"}, timeout=self.timeout)
+            r.raise_for_status()
+            for row in r.json().get("data", []):
+                pid = row.get("targetId"); img_url = row.get("imageUrl")
+                if row.get("state") != "Completed" or not img_url:
+                    continue
+                if spend: spend()
+                d = self._session.get(img_url, timeout=self.timeout)
+                d.raise_for_status()
+                self.disk_cache.put(pid, img_url, _round_thumb(d.content), d.headers.get("ETag"), d.headers.get("Last-Modified"))
+                stored += 1
+        return stored
+
+    def _lookup(self, ids, attempts, epoch):
+        try:
+            r = self._session.get(self.url, params={"placeIds": ",".join(str(i) for i in ids),
+                                                    "size": self.size, "format": "Png"}, timeout=self.timeout)
+            r.raise_for_status()
+            rows = {str(row.get("targetId")): row for row in r.json().get("data", [])}
+        except Exception as e:
+            _log_thumb.warning("lookup failed for %d ids: %s", len(ids), e)
+            # Offline / API down: fall back to whatever we stored last for these places
+            if self.disk_cache is not None:
+                for pid in ids:
+                    entry = self.disk_cache.latest(pid)
+                    if entry is not None:
+                        self._pool.submit(self._from_disk, pid, entry, epoch)
+                    else:
+                        self._finish(pid, None, epoch)
+                return
+            rows = {}
+        for pid in ids:
+            row = rows.get(str(pid)) or {}
+            state = row.get("state"); img_url = row.get("imageUrl")
+            if state == "Pending" and attempts.get(pid, 0) < self.pending_retries:
+                n = attempts.get(pid, 0) + 1
+                with self._cv:
+                    if epoch == self._epoch and pid in self._inflight:
+                        self._pending[pid] = (time.monotonic() + self.pending_delay * n, n)
+                        self._cv.notify()
+                continue
+            if not img_url:
+                self._finish(pid, None, epoch); continue
+            entry = self.disk_cache.get(pid, img_url) if self.disk_cache is not None else None
+            if entry is not None and not self.disk_cache.stale(entry):
+                self._pool.submit(self._from_disk, pid, entry, epoch)
+            else:
+                self._pool.submit(self._download, pid, img_url, entry, epoch)
+
+    def _from_disk(self, pid, entry, epoch):
+        if epoch != self._epoch:
+            return
+        try:
+            img = self.disk_cache.load(entry)
+        except Exception as e:
+            _log_thumb.warning("disk cache read failed for %s: %s", pid, e)
+            return self._download(pid, entry["url"], None, epoch)
+        self._finish(pid, img, epoch)
+
+    def _download(self, pid, img_url, entry, epoch):
+        if epoch != self._epoch:
+            return
+        img = None
+        headers = {}
+        if entry is not None:
+            # Conditional revalidation of a stale disk entry
+            if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            r = self._session.get(img_url, headers=headers, timeout=self.timeout)
+            if r.status_code == 304 and entry is not None:
+                self.disk_cache.mark_validated(pid, img_url)
+                return self._from_disk(pid, entry, epoch)
+            r.raise_for_status()
+            img = _round_thumb(r.content)
+            if self.disk_cache is not None:
+                self.disk_cache.put(pid, img_url, img, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        except Exception as e:
+            _log_thumb.warning("error loading thumbnail for %s: %s", pid, e)
+        self._finish(pid, img, epoch)
+
+    def _finish(self, pid, img, epoch):
+        with self._cv:
+            if epoch != self._epoch:
+                return
+            self._inflight.discard(pid)
+        try:
+            self.on_ready(pid, img)
+        except Exception as e:
+            _log_thumb.warning("on_ready failed for %s: %s", pid, e)
+
+# ==================== Process watching ====================
+
+ROBLOX_EXE = "robloxplayerbeta.exe"
+CRASH_HANDLER_EXE = "robloxcrashhandler.exe"
+
+class ProcessWatcher:
+    """Async view of the Roblox client process: `started`, `crash_handler_seen` and `exited` events.
+
+    The process table is walked once; after that only new PIDs (a cheap `psutil.pids()` diff)
+    get their name looked up, and once the client and its crash handler are known the watcher
+    just waits on the client PIDs. `started`/`exited` flip back if the client relaunches.
+    """
+    def __init__(self, name=ROBLOX_EXE, crash_name=CRASH_HANDLER_EXE, interval=0.1, psutil_mod=None):
+        import asyncio
+        self.name = name.lower(); self.crash_name = crash_name.lower(); self.interval = interval
+        self._psutil = psutil_mod or optional("psutil")
+        self.started = asyncio.Event(); self.crash_handler_seen = asyncio.Event(); self.exited = asyncio.Event()
+        self._procs = {}; self._known = set(); self._task = None; self._stopping = False
+        self.scans = 0; self.lookups = 0
+
+    @property
+    def pids(self):
+        return sorted(self._procs)
+
+    def start(self):
+        import asyncio
+        self._task = asyncio.get_running_loop().create_task(self._run()); return self
+
+    async def stop(self):
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except BaseException:
+                pass
+
+    async def wait(self, *events, timeout=None):
+        """True once any of `events` is set, False on timeout."""
+        import asyncio
+        tasks = [asyncio.ensure_future(e.wait()) for e in events]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            return bool(done)
+        finally:
+            for t in tasks: t.cancel()
+
+    def _seen(self, pid, name):
+        name = (name or "").lower()
+        if name == self.crash_name:
+            self.crash_handler_seen.set()
+        elif name == self.name and pid not in self._procs:
+            try:
+                proc = self._psutil.Process(pid)
+                if not self._alive(proc): return
+            except Exception:
+                return
+            self._procs[pid] = proc
+            self.exited.clear(); self.started.set()
+
+    def _alive(self, proc):
+        try:
+            return proc.is_running() and proc.status() != self._psutil.STATUS_ZOMBIE
+        except Exception:
+            return False
+
+    def _scan(self):
+        """Full walk of the process table; only at start and when the last client PID is gone."""
+        self.scans += 1; self._known = set()
+        for p in self._psutil.process_iter(['name']):
+            self._known.add(p.pid); self._seen(p.pid, p.info.get('name'))
+
+    def _poll_new(self):
+        pids = set(self._psutil.pids()); new = pids - self._known; self._known = pids
+        for pid in new:
+            self.lookups += 1
+            try:
+                self._seen(pid, self._psutil.Process(pid).name())
+            except Exception:
+                pass
+
+    def _reap(self, gone):
+        for p in gone:
+            self._procs.pop(p.pid, None)
+        if not self._procs:
+            self._scan()  # another client instance we missed?
+            if not self._procs:
+                self.started.clear(); self.exited.set()
+
+    async def _run(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        self._scan()
+        while not self._stopping:
+            if self._procs and self.crash_handler_seen.is_set():
+                # Nothing left to discover: block on the client PIDs (off the loop)
+                gone, _ = await loop.run_in_executor(None, lambda: self._psutil.wait_procs(list(self._procs.values()), timeout=1.0))
+                if gone: self._reap(gone)
+                continue
+            self._poll_new()
+            gone = [p for p in list(self._procs.values()) if not self._alive(p)]
+            if gone: self._reap(gone)
+            await asyncio.sleep(self.interval)
+
+# ==================== Join proxy ====================
+
+PROXY_HOST = "127.0.0.1"; PROXY_PORT = 51823
+MITM_CA_PATH = Path.home() / ".mitmproxy" / "mitmproxy-ca-cert.pem"
+CLIENT_ROOTS = {
+    "Roblox": Path.home() / "AppData/Local/Roblox",
+    "Bloxstrap": Path.home() / "AppData/Local/Bloxstrap",
+    "Fishstrap": Path.home() / "AppData/Local/Fishstrap",
+}
+
+def _port_open(host, port, timeout=0.5):
+    import socket
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+class JoinGameInterceptor:
+    """mitmproxy addon: marks join-game requests as teleports while `armed`.
+
+    Flows are filtered on host, then exact path, before anything is parsed, and the body is
+    only re-serialized when a field was actually added. `stats()` reports per-flow counters.
+    """
+    HOSTS = frozenset({"gamejoin.roblox.com"})
+    WANTED = frozenset({
+        "/v1/join-game",
+        "/v1/join-game-instance",
+        "/v1/join-play-together-game",
+        "/v1/join-play-together-game-instance",
+    })
+    COUNTERS = ("flows", "other_host", "other_path", "not_json", "bad_json", "rewritten", "unchanged")
+    def __init__(self, armed=False):
+        self.armed = armed
+        self.counters = dict.fromkeys(self.COUNTERS, 0); self.busy_ns = 0
+    def request(self, flow: 'http.HTTPFlow') -> None:
+        if not self.armed:
+            return
+        t0 = time.perf_counter_ns(); c = self.counters; c["flows"] += 1
+        try:
+            req = flow.request
+            if req.host not in self.HOSTS:
+                c["other_host"] += 1; return
+            if req.path.split("?", 1)[0].rstrip("/") not in self.WANTED:
+                c["other_path"] += 1; return
+            if "application/json" not in req.headers.get("Content-Type", "").lower():
+                c["not_json"] += 1; return
+            try:
+                body_json = req.json()
+            except Exception:
+                c["bad_json"] += 1; return
+            changed = False
+            if "isTeleport" not in body_json:
+                body_json["isTeleport"] = True; changed = True
+                _log_proxy.info("added isTeleport to %s", req.path)
+            if "gameJoinAttemptId" not in body_json:
+                body_json["gameJoinAttemptId"] = str(uuid.uuid4()); changed = True
+            if changed:
+                req.set_text(json.dumps(body_json)); c["rewritten"] += 1
+            else:
+                c["unchanged"] += 1
+        finally:
+            self.busy_ns += time.perf_counter_ns() - t0
+    def response(self, flow: 'http.HTTPFlow') -> None:
+        pass
+    def stats(self):
+        n = self.counters["flows"]
+        return dict(self.counters, avg_us=round(self.busy_ns / n / 1000, 2) if n else 0.0)
+
+class ProxyDaemon:
+    """mitmproxy kept running on its own thread and event loop so joins after the first skip its startup.
+
+    The join-game rewrite is off until `arm()`; `health()` reports loop/listener/CA state.
+    """
+    def __init__(self, host=PROXY_HOST, port=PROXY_PORT, ca_path=MITM_CA_PATH):
+        self.host = host; self.port = port; self.ca_path = Path(ca_path)
+        self.interceptor = JoinGameInterceptor(armed=False)
+        self._loop = None; self._master = None; self._thread = None
+        self._ready = threading.Event(); self._error = None
+        self.started_at = None; self.joins = 0
+
+    @property
+    def armed(self):
+        return self.interceptor.armed
+
+    def arm(self):
+        self.joins += 1; self.interceptor.armed = True
+    def disarm(self):
+        self.interceptor.armed = False
+
+    def start(self, timeout=15.0):
+        """Starts mitmproxy and blocks until it listens (and the CA exists); False on failure."""
+        if self._thread is not None:
+            return self.healthy()
+        t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="proxy-daemon", daemon=True); self._thread.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self._error is None:
+            if self._ready.is_set() and self._listening() and self.ca_path.exists():
+                self.started_at = time.time()
+                _log_proxy.info("daemon up in %.0f ms on %s:%s", (time.perf_counter() - t0)*1000, self.host, self.port)
+                return True
+            time.sleep(0.05)
+        _log_proxy.warning("daemon failed to start: %s", self._error or "timeout")
+        self.stop(); return False
+
+    def _run(self):
+        import asyncio
+        mitm = optional("mitmproxy")
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            options = mitm.Options(listen_host=self.host, listen_port=self.port)
+            self._master = mitm.DumpMaster(options, with_termlog=False, with_dumper=False)
+            self._master.addons.add(self.interceptor)
+            self._ready.set()
+            await self._master.run()
+        try:
+            asyncio.run(main())
+        except Exception as e:
+            self._error = e
+        finally:
+            self._ready.clear()
+
+    def _listening(self):
+        return _port_open(self.host, self.port)
+
+    def health(self):
+        alive = self._thread is not None and self._thread.is_alive() and self._ready.is_set()
+        return {"alive": alive, "listening": alive and self._listening(), "ca": self.ca_path.exists(),
+                "armed": self.armed, "joins": self.joins, "interceptor": self.interceptor.stats(), "error": repr(self._error) if self._error else None,
+                "uptime": round(time.time() - self.started_at, 1) if self.started_at else 0.0}
+
+    def healthy(self):
+        h = self.health(); return h["alive"] and h["listening"] and h["ca"]
+
+    async def _shutdown(self):
+        r = self._master.shutdown()
+        if hasattr(r, "__await__"): await r
+
+    def stop(self):
+        self.disarm()
+        loop, master = self._loop, self._master
+        if loop is not None and master is not None and loop.is_running():
+            import asyncio
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None; self._loop = None; self._master = None; self._ready.clear()
+
+# ==================== Search jobs ====================
+
+class SearchCancelled(Exception):
+    """Raised inside a search once a newer one has superseded it."""
+
+class SearchJob:
+    """One search generation: its cancel flag, the threads it spawned and cleanups run on cancel."""
+    def __init__(self, gen):
+        self.gen = gen; self.cancel_event = threading.Event()
+        self._lock = threading.Lock(); self._threads = []; self._cleanups = []
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise SearchCancelled(f"search #{self.gen} superseded")
+
+    def spawn(self, target, *args, name="search"):
+        t = threading.Thread(target=target, args=args, name=f"{name}-{self.gen}", daemon=True)
+        with self._lock:
+            self._threads.append(t)
+        t.start(); return t
+
+    def on_cancel(self, fn):
+        """Runs `fn` when the job is cancelled (immediately if it already is)."""
+        with self._lock:
+            if not self.cancelled:
+                self._cleanups.append(fn); return
+        fn()
+
+    def cancel(self):
+        with self._lock:
+            if self.cancel_event.is_set():
+                return
+            self.cancel_event.set(); cleanups, self._cleanups = self._cleanups, []
+        for fn in cleanups:
+            try:
+                fn()
+            except Exception as e:
+                _log_search.debug("cancel cleanup failed: %s", e)
+
+    def alive(self):
+        with self._lock:
+            return [t for t in self._threads if t.is_alive()]
+
+    def join(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in list(self._threads):
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not self.alive()
+
+class SearchJobs:
+    """Hands out search generations; starting one cancels the previous, so at most one is live."""
+    def __init__(self):
+        self._lock = threading.Lock(); self._gen = 0; self.current = None; self._retired = []
+
+    def start(self):
+        with self._lock:
+            self._gen += 1; old, self.current = self.current, SearchJob(self._gen)
+            self._retired = [j for j in self._retired if j.alive()]
+            if old is not None:
+                self._retired.append(old)
+        if old is not None:
+            old.cancel(); _log_search.debug("search #%d superseded by #%d", old.gen, self._gen)
+        return self.current
+
+    def is_current(self, job):
+        return job is self.current and not job.cancelled
+
+    def cancel(self):
+        job = self.current
+        if job is not None:
+            job.cancel()
+
+    def alive(self):
+        """Threads still running for superseded or cancelled searches."""
+        with self._lock:
+            jobs = self._retired + ([self.current] if self.current is not None and self.current.cancelled else [])
+        return [t for j in jobs for t in j.alive()]
+
+# ==================== Prefetch ====================
+
+class Prefetcher:
+    """Warms listings and first-screen icons for favourites/recent places while the app is idle.
+
+    One low-priority thread walks `set_targets()` once the user has been idle for `idle_after`
+    seconds. A first pass puts universe, root place and subplace listing of every target into the
+    engine's SearchCache; a second stores the first `thumbs_per_place` icons of each in the
+    pipeline's disk cache, so picking one of those places renders from cache. Every request takes
+    a token from a `budget`-per-hour bucket. `pause()` (an interactive search started) aborts the
+    current step until `resume()` plus `idle_after`. A finished step is redone once the search
+    cache TTL has passed; a failed one is retried after `retry_base` seconds, doubling up to `retry_max`.
+    """
+    def __init__(self, engine, thumbs=None, budget=300, burst=100, idle_after=5.0, thumbs_per_place=12,
+                 retry_base=30.0, retry_max=1800.0):
+        self.engine = engine; self.thumbs = thumbs; self.idle_after = float(idle_after)
+        self.thumbs_per_place = int(thumbs_per_place); self.retry_base = float(retry_base); self.retry_max = float(retry_max)
+        # (step, place_id) -> when a finished step goes stale / (consecutive failures, when to retry)
+        self._cv = threading.Condition(); self._targets = []; self._done = {}; self._failed = {}
+        self._busy = False; self._stopped = False; self._idle_since = time.monotonic()
+        self._interrupt = threading.Event(); self._thread = None
+        self.requests = 0; self.set_budget(budget, burst)
+
+    def set_budget(self, budget, burst=100):
+        """`budget` requests per hour (0 disables prefetching)."""
+        self.budget = max(0, int(budget))
+        self._bucket = TokenBucket(self.budget / 3600.0, max(1, min(int(burst), self.budget))) if self.budget else None
+        with self._cv:
+            self._cv.notify()
+
+    def set_targets(self, place_ids):
+        with self._cv:
+            self._targets = list(dict.fromkeys(str(p) for p in place_ids))
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+                self._thread.start()
+            self._cv.notify()
+
+    def pause(self):
+        with self._cv:
+            self._busy = True; self._interrupt.set()
+
+    def resume(self):
+        with self._cv:
+            self._busy = False; self._idle_since = time.monotonic(); self._cv.notify()
+
+    def stop(self):
+        with self._cv:
+            self._stopped = True; self._interrupt.set(); self._cv.notify()
+
+    def _next(self):
+        """Blocks until there is work and the user is idle; (step, place_id), or None once stopped."""
+        with self._cv:
+            while not self._stopped:
+                now = time.monotonic(); todo = []; due = None
+                for item in ((step, p) for step in ("listing", "icons") for p in self._targets):
+                    at = self._due_at(item, now)
+                    if at <= now: todo.append(item)
+                    elif at < float("inf") and (due is None or at < due): due = at
+                ready = todo and self._bucket is not None and not self._busy
+                wait = self.idle_after - (now - self._idle_since)
+                if ready and wait <= 0:
+                    self._interrupt.clear(); return todo[0]
+                self._cv.wait(wait if ready else (due - now if due is not None else None))
+            return None
+
+    def _due_at(self, item, now):
+        step, place_id = item
+        if step == "icons" and self._done.get(("listing", place_id), 0.0) <= now:
+            return float("inf")  # icons come from the listing; wait for a current one
+        return max(self._done.get(item, 0.0), self._failed.get(item, (0, 0.0))[1])
+
+    def _run(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            step, place_id = item; t0 = time.perf_counter(); spent = self.requests
+            try:
+                if step == "listing":
+                    self._prefetch_listing(place_id)
+                else:
+                    self._prefetch_icons(place_id)
+            except SearchCancelled:
+                _log_search.debug("prefetch %s of %s paused", step, place_id); continue
+            except Exception as e:
+                n = self._failed.get(item, (0, 0.0))[0] + 1; backoff = min(self.retry_max, self.retry_base * 2 ** (n - 1))
+                _log_search.info("prefetch %s of %s failed (retry in %.0f s): %s", step, place_id, backoff, e)
+                with self._cv:
+                    self._failed[item] = (n, time.monotonic() + backoff)
+                continue
+            ttl = self.engine.search_cache.ttl
+            with self._cv:
+                # ttl 0 means listings are never fresh; re-running would only burn the budget
+                self._failed.pop(item, None); self._done[item] = time.monotonic() + ttl if ttl > 0 else float("inf")
+            _log_search.debug("prefetched %s of %s in %.0f ms (%d requests)", step, place_id,
+                              (time.perf_counter() - t0) * 1000, self.requests - spent)
+
+    def _spend(self):
+        bucket = self._bucket
+        if bucket is None or not bucket.acquire(self._interrupt):
+            raise SearchCancelled("prefetch paused")
+        self.requests += 1
+
+    def _prefetch_listing(self, place_id):
+        cache = self.engine.search_cache
+        universe_id = cache.universe_for(place_id)
+        if universe_id is None:
+            self._spend(); universe_id = self.engine.resolve_universe(place_id)
+        listing = cache.listing(universe_id)
+        if listing is not None and listing[2]:
+            return
+        self._spend(); root = self.engine.fetch_root_place(universe_id, place_id)
+        places = [p for page in self.engine.iter_place_pages(universe_id, root, cancel=self._interrupt,
+                                                              on_request=self._spend) for p in page]
+        cache.store_listing(universe_id, root, places)
+
+    def _prefetch_icons(self, place_id):
+        universe_id = self.engine.search_cache.universe_for(place_id)
+        listing = self.engine.search_cache.listing(universe_id) if universe_id is not None else None
+        if listing is None or self.thumbs is None or not self.thumbs_per_place:
+            return
+        self.thumbs.warm([p.get("id") for p in listing[1][:self.thumbs_per_place]], spend=self._spend)
+
+# ==================== Engine ====================
+
+class HoprEngine:
+    """Search, pre-seed and proxy logic without any UI; callers pass callbacks for progress."""
+    def __init__(self, data_dir: Path|None=None, http=None, search_cache_ttl=3600, cookies=None):
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.http = http or HTTP
+        self.search_cache = SearchCache(self.data_dir / "search_cache.json", ttl=search_cache_ttl)
+        self._proxy_daemon = None; self._proxy_lock = threading.Lock()
+        self._join_sessions = {}; self._join_lock = threading.Lock()
+        self.cookies = cookies or CookieProvider()
+        self.client_roots = dict(CLIENT_ROOTS)
+        self.ca_index = CaBundleIndex(self.data_dir / "ca_index.json")
+
+    def get(self, url, timeout=10):
+        try:
+            _log_http.debug("GET %s", url)
+            r = self.http.get(url, timeout=timeout)
+            if _log_http.isEnabledFor(logging.DEBUG):
+                try:
+                    length = r.headers.get('Content-Length') or len(r.content or b'')
+                    _log_http.debug("GET done %s length=%s", r.status_code, length)
+                    ct = r.headers.get('Content-Type','')
+                    if 'application/json' in ct.lower() or 'text' in ct.lower():
+                        snippet = (r.text[:300] + '...') if r.text and len(r.text) > 300 else r.text
+                        _log_http.debug("body snippet: %s", snippet)
+                except Exception:
+                    pass
+            return r
+        except Exception as e:
+            _log_http.warning("GET %s failed: %s", url, e)
+            raise
+
+    # ---------- Search ----------
+    def resolve_universe(self, place_id):
+        universe_id = self.search_cache.universe_for(place_id)
+        if universe_id:
+            return universe_id
+        # Step 1: Get universe ID from place
+        u = self.get(f"https://apis.roblox.com/universes/v1/places/{place_id}/universe", timeout=10)
+        u.raise_for_status()
+        universe_data = u.json()
+        universe_id = universe_data.get("universeId")
+        if not universe_id:
+            raise Exception("Invalid Place ID or universe not found")
+        self.search_cache.store_universe(place_id, universe_id)
+        return universe_id
+
+    def fetch_root_place(self, universe_id, place_id):
+        # Step 1.5: Get the actual root place ID from universe details
+        universe_details = self.get(f"https://games.roblox.com/v1/games?universeIds={universe_id}", timeout=10)
+        universe_details.raise_for_status()
+        games_data = universe_details.json().get("data", [])
+        if games_data:
+            return games_data[0].get("rootPlaceId")
+        # Fallback: assume searched place is root if we can't get universe details
+        return int(place_id)
+
+    def iter_place_pages(self, universe_id, root_place_id, cancel=None, on_request=None):
+        """Yields each page of subplaces (deduplicated, root flagged) as soon as it arrives.
+
+        Setting the `cancel` event stops pagination with SearchCancelled before the next request;
+        `on_request()` runs before every page request and may raise to stop it as well.
+        """
+        cursor = None
+        seen = set()
+        while True:
+            url = f"https://develop.roblox.com/v1/universes/{universe_id}/places?limit=100"
+            if cursor:
+                url += f"&cursor={cursor}"
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled(f"pagination of universe {universe_id} cancelled")
+            if on_request is not None:
+                on_request()
+            r = self.get(url, timeout=10)
+            r.raise_for_status()
+            data = r.json()
+            batch = data.get("data", [])
+
+            if not batch:
+                _log_search.debug("empty page received, stopping")
+                break
+
+            page = []
+            for p in batch:
+                pid = p.get("id")
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                # Set default values for timestamps
+                p["created"] = None
+                p["updated"] = None
+                # Mark root place - now using the actual root place ID
+                if root_place_id and int(pid) == int(root_place_id):
+                    p["is_root"] = True
+                page.append(p)
+            yield page
+
+            # Check next cursor
+            next_cursor = data.get("nextPageCursor")
+            if not next_cursor or next_cursor == cursor:
+                break
+            cursor = next_cursor
+
+    def listing(self, universe_id, place_id, use_cache=True, cancel=None):
+        """(root_place_id, places) for a universe: the fresh cached listing, or fetched and stored."""
+        cached = self.search_cache.listing(universe_id) if use_cache else None
+        if cached is not None and cached[2]:
+            return cached[0], cached[1]
+        root = self.fetch_root_place(universe_id, place_id)
+        places = [p for page in self.iter_place_pages(universe_id, root, cancel=cancel) for p in page]
+        self.search_cache.store_listing(universe_id, root, places)
+        return root, places
+
+    def load_timestamps(self, places, cookie=None):
+        """Fills Created/Updated for places that lack them (blocking) and persists them."""
+        missing = [p for p in places if not p.get("updated")]
+        if missing:
+            loader = TimestampLoader(cookie=cookie if cookie is not None else (self.get_roblosecurity() or ""))
+            loader.submit(missing); loader.close(wait=True)
+            self.search_cache.touch(); self.search_cache.flush()
+
+    def search(self, place_id, timestamps=True, cookie=None, use_cache=True):
+        """Blocking search: {'place_id', 'universe_id', 'root_place_id', 'places'}; reuses fresh cached listings."""
+        universe_id = self.resolve_universe(place_id)
+        root, places = self.listing(universe_id, place_id, use_cache)
+        if timestamps:
+            self.load_timestamps(places, cookie)
+        return {"place_id": int(place_id), "universe_id": universe_id, "root_place_id": root, "places": places}
+
+    def search_many(self, place_ids, timestamps=True, cookie=None, use_cache=True, workers=8, on_group=None, cancel=None):
+        """Batch search: universes are resolved concurrently and every universe is listed once.
+
+        Returns (groups, errors) in input order. A group is {'place_id', 'place_ids', 'universe_id',
+        'root_place_id', 'places'}, with every requested ID that shares the universe in 'place_ids';
+        an error is {'place_id', 'error'}. `on_group(group)` is called (from a pool thread) as soon
+        as each listing is in, before timestamps are loaded.
+        """
+        ids = list(dict.fromkeys(str(p) for p in place_ids))
+        def attempt(fn, *args):
+            try:
+                return fn(*args), None
+            except SearchCancelled:
+                raise
+            except Exception as e:
+                return None, e
+        groups, errors = {}, []
+        with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="batch") as pool:
+            for pid, (universe_id, err) in zip(ids, pool.map(lambda p: attempt(self.resolve_universe, p), ids)):
+                if err is not None:
+                    errors.append({"place_id": int(pid), "error": str(err)})
+                else:
+                    groups.setdefault(universe_id, []).append(pid)
+            _log_search.info("batch: %d ids -> %d universes", len(ids), len(groups))
+            def fetch(universe_id, pids):
+                res, err = attempt(self.listing, universe_id, pids[0], use_cache, cancel)
+                if err is not None:
+                    return None, err
+                group = {"place_id": int(pids[0]), "place_ids": [int(p) for p in pids], "universe_id": universe_id,
+                         "root_place_id": res[0], "places": res[1]}
+                if on_group is not None:
+                    on_group(group)
+                return group, None
+            out = []
+            for (universe_id, pids), (group, err) in zip(groups.items(), pool.map(lambda kv: fetch(*kv), groups.items())):
+                if err is not None:
+                    errors.extend({"place_id": int(p), "error": str(err)} for p in pids)
+                else:
+                    out.append(group)
+        if timestamps:
+            self.load_timestamps([p for g in out for p in g["places"]], cookie)
+        order = {int(p): i for i, p in enumerate(ids)}
+        errors.sort(key=lambda e: order[e["place_id"]])
+        return out, errors
+
+    # ---------- Join ----------
+    def new_session(self, cookie: str|None):
+        # IMPORTANT: avoid inheriting system proxies; don't let mitm catch this pre-seed
+        # (shared client sessions have trust_env off and reuse the pooled connections)
+        sess = self.http.new_session()
+        sess.headers.update({
+            "User-Agent": "Roblox/WinInet",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Referer": "https://www.roblox.com/",
+            "Origin": "https://www.roblox.com",
+        })
+        if cookie:
+            sess.headers["Cookie"] = f".ROBLOSECURITY={cookie};"
+        # X-CSRF
+        try:
+            r = sess.post("https://auth.roblox.com/v2/logout", timeout=10)
+            token = r.headers.get("x-csrf-token") or r.headers.get("X-CSRF-TOKEN")
+            if token:
+                sess.headers["X-CSRF-TOKEN"] = token
+        except Exception:
+            pass
+        return sess
+
+    @staticmethod
+    def _cookie_key(cookie):
+        return hashlib.sha256((cookie or "").encode("utf-8")).hexdigest()[:16]
+
+    def has_join_session(self, cookie):
+        """True when a CSRF-primed session for `cookie` is pooled (a join needs no extra round trips)."""
+        sess = self._join_sessions.get(self._cookie_key(cookie))
+        return sess is not None and "X-CSRF-TOKEN" in sess.headers
+
+    def join_session(self, cookie):
+        """Pooled pre-seed session per cookie (keyed by its hash): warm connections and a cached CSRF token."""
+        key = self._cookie_key(cookie)
+        with self._join_lock:
+            sess = self._join_sessions.get(key)
+            if sess is None or "X-CSRF-TOKEN" not in sess.headers:
+                sess = self._join_sessions[key] = self.new_session(cookie)
+            return sess
+
+    def _post_csrf(self, sess, url, **kw):
+        """POST that answers a 403 token challenge once with the fresh x-csrf-token; returns (response, round trips)."""
+        r = sess.post(url, **kw)
+        token = r.headers.get("x-csrf-token")
+        if r.status_code == 403 and token:
+            _log_join.debug("CSRF token refreshed")
+            sess.headers["X-CSRF-TOKEN"] = token
+            return sess.post(url, **kw), 2
+        return r, 1
+
+    def preseed_join_root(self, root_place_id: int, cookie: str):
+        t0 = time.perf_counter(); warm = self.has_join_session(cookie); trips = 0
+        try:
+            sess = self.join_session(cookie)
+            trips += 0 if warm else 1
+            payload = {
+                "placeId": int(root_place_id),
+                "isTeleport": True,
+                "isImmersiveAdsTeleport": False,
+                "gameJoinAttemptId": str(uuid.uuid4()),
+            }
+            _log_join.info("pre-seed firing for root %s", root_place_id)
+            _log_join.debug("pre-seed payload: %s", payload)
+            r, n = self._post_csrf(sess, "https://gamejoin.roblox.com/v1/join-game", json=payload, timeout=15); trips += n
+            _log_join.info("pre-seed status %s in %.0f ms (%s session, %d round trips)",
+                           r.status_code, (time.perf_counter() - t0) * 1000, "warm" if warm else "new", trips)
+            if _log_join.isEnabledFor(logging.DEBUG):
+                try: _log_join.debug("pre-seed body: %s", r.text[:800])
+                except Exception: pass
+            data = {}
+            try: data = r.json()
+            except Exception: pass
+            # Status 2 == ready to join
+            return (r.status_code == 200 and data.get("status") == 2)
+        except Exception as e:
+            _log_join.warning("pre-seed failed: %s", e)
+            return False
+
+    def launch_roblox(self, place_id):
+        roblox_url = f"roblox://experiences/start?placeId={place_id}"
+        system = platform.system()
+        try:
+            if system == "Windows":
+                os.startfile(roblox_url)
+            elif system == "Darwin":
+                subprocess.run(["open", roblox_url], check=False)
+            else:
+                subprocess.run(["xdg-open", roblox_url], check=False)
+        except Exception:
+            webbrowser.open(roblox_url)
+
+    # ---------- Join proxy ----------
+    def _install_ca(self, ca_path: Path):
+        """Appends the mitm CA to ssl/cacert.pem of every installed client version not yet trusting it."""
+        fp = self.ca_index.fingerprint(ca_path)
+        if fp is None:
+            return
+        mitm_ca_content = None; dirty = False
+        for app_name, path in self.client_roots.items():
+            versions_path = path / "Versions"
+            if self.ca_index.trusted(versions_path, fp):
+                continue
+            try:
+                dir_mtime = versions_path.stat().st_mtime_ns
+            except OSError:
+                continue
+            folders = {}; complete = True
+            for version_folder in versions_path.iterdir():
+                if not version_folder.is_dir():
+                    continue
+                if self.ca_index.folder_ok(versions_path, version_folder, fp):
+                    folders[version_folder.name] = self._ca_entry(version_folder, fp)
+                    continue
+                exe_files = list(version_folder.glob("*PlayerBeta.exe"))
+                if not exe_files:
+                    continue
+                # Ensure libcurl bundle includes mitm CA
+                try:
+                    if mitm_ca_content is None:
+                        mitm_ca_content = ca_path.read_text(encoding="utf-8")
+                    ssl_folder = version_folder / "ssl"; ssl_folder.mkdir(exist_ok=True)
+                    ca_file = ssl_folder / "cacert.pem"
+                    if ca_file.exists():
+                        existing_content = ca_file.read_text(encoding="utf-8")
+                        if mitm_ca_content not in existing_content:
+                            with open(ca_file, "a", encoding="utf-8") as f:
+                                f.write("\n" + mitm_ca_content)
+                    else:
+                        with open(ca_file, "w", encoding="utf-8") as f:
+                            f.write(mitm_ca_content)
+                    folders[version_folder.name] = self._ca_entry(version_folder, fp)
+                except Exception as e:
+                    _log_proxy.warning("CA install failed for %s: %s", version_folder, e); complete = False
+            # A failed folder leaves the dir untrusted so the next join retries it
+            self.ca_index.record(versions_path, dir_mtime if complete else None, folders); dirty = True
+        if dirty:
+            self.ca_index.flush()
+
+    def _ca_entry(self, version_folder: Path, fp):
+        return {"mtime": version_folder.stat().st_mtime_ns, "ca": self.ca_index.bundle_stat(version_folder), "fp": fp}
+
+    def _override_client_settings(self, status, host=PROXY_HOST, port=PROXY_PORT):
+        """Points the client at the proxy via IxpSettings.json; returns {path: original} for restore."""
+        proxy_settings = {
+            "DFStringHttpCurlProxyHostAndPort": f"{host}:{port}",
+            "DFStringDebugPlayerHttpProxyUrl": f"http://{host}:{port}",
+            "DFFlagDebugEnableHttpProxy": "True",
+            "DFStringHttpCurlProxyHostAndPortForExternalUrl": f"{host}:{port}",
+        }
+        original_settings = {}
+        # ClientSettings override
+        roblox_path = Path.home() / "AppData" / "Local" / "Roblox"
+
+        if not roblox_path.exists():
+            status("Roblox not found. Please install Roblox")
+
+        # File path
+        file_path = roblox_path / "ClientSettings" / "IxpSettings.json"
+
+        if not file_path.exists():
+            _log_proxy.debug("creating %s", file_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.touch()
+        try:
+            existing = {}
+            if file_path.exists():
+                with open(file_path, "r", encoding="utf-8") as f:
+                    existing = json.load(f)
+            original_settings[str(file_path)] = existing
+            updated = dict(existing); updated.update(proxy_settings)
+            
+            os.chmod(file_path, stat.S_IWRITE)
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(updated, f, indent=4)
+            os.chmod(file_path, stat.S_IREAD)
+        except Exception:
+            pass
+        return original_settings
+
+    def _restore_client_settings(self, original_settings):
+        for file_path, content in original_settings.items():
+            try:
+                os.chmod(file_path, stat.S_IWRITE)
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump(content, f, indent=4)
+                os.chmod(file_path, stat.S_IREAD)
+            except Exception as e:
+                _log_proxy.warning("restore failed %s: %s", file_path, e)
+
+    async def _watch_join(self, status, original_settings):
+        """Waits out one client session; returns the final status message."""
+        status("Waiting for Roblox to start…")
+        watcher = ProcessWatcher().start()
+        try:
+            if not await watcher.wait(watcher.started, timeout=10.0):
+                self._restore_client_settings(original_settings)
+                return "Proxy stopped. Roblox did not open."
+            # Wait for the crash handler (client is past the join); tolerate the client being gone for up to 5 s
+            while not watcher.crash_handler_seen.is_set():
+                if watcher.exited.is_set() and not await watcher.wait(watcher.started, watcher.crash_handler_seen, timeout=5.0):
+                    self._restore_client_settings(original_settings)
+                    return "Proxy stopped. Roblox closed unexpectedly."
+                await watcher.wait(watcher.crash_handler_seen, watcher.exited)
+            # After start, restore original files
+            self._restore_client_settings(original_settings)
+            # Wait for exit
+            await watcher.exited.wait()
+            _log_proxy.info("process watcher: %d full scans, %d name lookups", watcher.scans, watcher.lookups)
+            return "Proxy stopped. Ready."
+        finally:
+            await watcher.stop()
+
+    def proxy_daemon(self, start=True):
+        """The warm ProxyDaemon, (re)started if it is not healthy; None if the proxy can't run here."""
+        with self._proxy_lock:
+            d = self._proxy_daemon
+            if d is not None and d.healthy():
+                return d
+            if not start or not proxy_available():
+                return None
+            if d is not None:
+                _log_proxy.warning("daemon unhealthy, restarting: %s", d.health()); d.stop()
+            self._proxy_daemon = d = ProxyDaemon()
+            if d.start():
+                return d
+            self._proxy_daemon = None; return None
+
+    def stop_proxy_daemon(self):
+        with self._proxy_lock:
+            if self._proxy_daemon is not None:
+                self._proxy_daemon.stop(); self._proxy_daemon = None
+
+    async def run_proxy(self, on_status=None, on_done=None, warm=False):
+        """Runs the join-game proxy until Roblox exits; `on_status` gets progress, `on_done` the final message.
+
+        With `warm`, the long-lived ProxyDaemon is reused (and left running); it is only armed for this join.
+        """
+        status = on_status or print; done = on_done or print
+        import asyncio
+        t0 = time.perf_counter()
+        daemon = self.proxy_daemon() if warm else None
+        if daemon is not None:
+            self._install_ca(daemon.ca_path); daemon.arm()
+            _log_proxy.info("ready in %.1f ms (warm, joins=%d)", (time.perf_counter() - t0)*1000, daemon.joins)
+            try:
+                done(await self._watch_join(status, self._override_client_settings(status)))
+            finally:
+                daemon.disarm(); _log_proxy.info("interceptor: %s", daemon.interceptor.stats())
+            return
+        mitm = optional("mitmproxy")
+        options = mitm.Options(listen_host=PROXY_HOST, listen_port=PROXY_PORT)
+        master = mitm.DumpMaster(options, with_termlog=False, with_dumper=False)
+        interceptor = JoinGameInterceptor(armed=True); master.addons.add(interceptor)
+        asyncio.create_task(master.run())
+        # Wait for the CA and the listener before pointing the client at us
+        ca_path = MITM_CA_PATH
+        for _ in range(200):
+            if ca_path.exists() and _port_open(PROXY_HOST, PROXY_PORT):
+                break
+            await asyncio.sleep(0.05)
+        self._install_ca(ca_path)
+        _log_proxy.info("ready in %.1f ms (cold)", (time.perf_counter() - t0)*1000)
+        try:
+            done(await self._watch_join(status, self._override_client_settings(status)))
+        finally:
+            _log_proxy.info("interceptor: %s", interceptor.stats())
+            try:
+                await master.shutdown()
+            except Exception:
+                pass
+
+    def join(self, place_id, cookie=None, root_place_id=None, on_status=None):
+        """Headless join: pre-seed the root place, fire the deeplink and run the proxy until Roblox exits."""
+        status = on_status or print
+        cookie = cookie if cookie is not None else (self.get_roblosecurity() or "")
+        if root_place_id is None:
+            root_place_id = self.fetch_root_place(self.resolve_universe(place_id), place_id)
+        if cookie and not self.preseed_join_root(int(root_place_id), cookie):
+            status("GameJoin seed failed; launching anyway…")
+        status("Launching Roblox…")
+        self.launch_roblox(place_id)
+        if not proxy_available():
+            status("Proxy not available. (Install mitmproxy + psutil for full flow)")
+            return False
+        import asyncio
+        asyncio.run(self.run_proxy(on_status=status, on_done=status))
+        return True
+
+    # ---------- Cookie auto-read (Windows DPAPI) ----------
+    def get_roblosecurity(self):
+        return self.cookies.get()
+
+
+# ==================== CLI ====================
+
+def _read_place_ids(args):
+    ids = list(args.place_ids)
+    if args.file:
+        text = sys.stdin.read() if args.file == "-" else Path(args.file).read_text(encoding="utf-8")
+        ids += re.findall(r"\d+", text)
+    bad = [i for i in ids if not str(i).isdigit()]
+    if bad:
+        raise SystemExit(f"Place ID must be a number: {', '.join(bad)}")
+    return ids
+
+async def _watch(args):
+    """`watch` command: prints watcher events as they happen (handy with dummy processes off Windows)."""
+    import asyncio
+    if optional("psutil") is None:
+        print("psutil is required"); return 1
+    watcher = ProcessWatcher(args.name, args.crash_name).start(); t0 = time.perf_counter()
+    def report(what): print(f"{time.perf_counter() - t0:7.2f}s {what} pids={watcher.pids}", flush=True)
+    async def on(event, what):
+        await event.wait(); report(what)
+    tasks = [asyncio.ensure_future(on(watcher.started, "started")),
+             asyncio.ensure_future(on(watcher.crash_handler_seen, "crash handler seen"))]
+    ok = await watcher.wait(watcher.started, timeout=args.timeout) and await watcher.wait(watcher.exited, timeout=args.timeout)
+    if ok: report("exited")
+    for t in tasks: t.cancel()
+    await watcher.stop()
+    print(f"{watcher.scans} full scans, {watcher.lookups} name lookups")
+    return 0 if ok else 1
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="hopr", description="Headless Hopr: list and join Roblox subplaces.")
+    ap.add_argument("-v", "--verbose", action="store_true", help="debug logging for every subsystem")
+    ap.add_argument("--debug", action="append", default=[], metavar="SUBSYSTEM",
+                    help=f"debug logging for some subsystems ({', '.join(SUBSYSTEMS)}); repeatable or comma-separated")
+    ap.add_argument("--log-file", help="also log to this file (rotated)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("search", help="list the subplaces of one or more places")
+    s.add_argument("place_ids", nargs="*", help="place IDs")
+    s.add_argument("-f", "--file", help="read place IDs from a file ('-' for stdin)")
+    s.add_argument("--json", action="store_true", help="print results as JSON")
+    s.add_argument("--no-timestamps", action="store_true", help="skip Created/Updated lookups")
+    s.add_argument("--no-cache", action="store_true", help="ignore cached listings")
+    s.add_argument("--cookie", help=".ROBLOSECURITY to use (default: read from Roblox)")
+    s.add_argument("--workers", type=int, default=8, help="concurrent universe lookups/listings (default 8)")
+    j = sub.add_parser("join", help="pre-seed, launch Roblox and run the join proxy")
+    j.add_argument("place_id")
+    j.add_argument("--root", type=int, help="root place ID (default: looked up)")
+    j.add_argument("--cookie", help=".ROBLOSECURITY to use (default: read from Roblox)")
+    w = sub.add_parser("watch", help="print Roblox start / crash handler / exit events")
+    w.add_argument("--name", default=ROBLOX_EXE, help=f"client process name (default {ROBLOX_EXE})")
+    w.add_argument("--crash-name", default=CRASH_HANDLER_EXE, help=f"crash handler name (default {CRASH_HANDLER_EXE})")
+    w.add_argument("--timeout", type=float, default=None, help="give up after this many seconds per phase")
+    args = ap.parse_args(argv)
+    debug = [x for d in args.debug for x in d.split(",") if x]
+    setup_logging("DEBUG" if args.verbose else "INFO", debug=debug, log_file=args.log_file)
+    if args.cmd == "watch":
+        import asyncio
+        return asyncio.run(_watch(args))
+    engine = HoprEngine()
+
+    if args.cmd == "join":
+        if not args.place_id.isdigit():
+            raise SystemExit("Place ID must be a number")
+        try:
+            return 0 if engine.join(args.place_id, cookie=args.cookie, root_place_id=args.root) else 1
+        finally:
+            engine.search_cache.flush()
+
+    # Place IDs sharing a universe are listed once and reported as one group
+    groups, errors = engine.search_many(_read_place_ids(args), timestamps=not args.no_timestamps, cookie=args.cookie,
+                                        use_cache=not args.no_cache, workers=args.workers)
+    engine.search_cache.flush()  # the cache writes in the background; don't lose it on exit
+    failed = len(errors)
+    results = groups + errors
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for res in results:
+            if "error" in res:
+                print(f"# {res['place_id']}: error: {res['error']}"); continue
+            ids = ",".join(str(p) for p in res["place_ids"])
+            print(f"# {ids} universe={res['universe_id']} root={res['root_place_id']} ({len(res['places'])} places)")
+            for p in res["places"]:
+                print("\t".join([str(p.get("id")), str(p.get("name", "")), str(p.get("created") or "-"),
+                                 str(p.get("updated") or "-")] + (["ROOT"] if p.get("is_root") else [])))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
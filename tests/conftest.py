@@ -0,0 +1,30 @@
+import os, sys, tempfile, time
+from pathlib import Path
+
+# Settings and caches go to a throwaway profile; Qt runs without a display
+os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="hopr-tests-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    pytest.importorskip("PySide6")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def pump(qapp):
+    """pump(seconds, until=None): runs the Qt event loop until `until()` is true or time is up."""
+    def run(seconds, until=None):
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            qapp.processEvents()
+            if until is not None and until():
+                return True
+            time.sleep(0.005)
+        return until is None or bool(until())
+    return run
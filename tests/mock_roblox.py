@@ -0,0 +1,68 @@
+"""A slow local stand-in for the Roblox web APIs, shared by tests and benchmarks.
+
+`serve()` starts it on a free port; `ToLocal(srv.base)` mounted on `hopr_core.HTTP.session` for
+"https://" sends every API call there, through the real pool and retry stack.
+"""
+import json, re, threading, time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+import hopr_core
+
+
+class SlowRoblox(BaseHTTPRequestHandler):
+    """Fake Roblox APIs behind one local server; the path starts with the real host name.
+
+    Place N lives in universe `universe_of(N)`; universe U has root place U//10*1000 and `pages`
+    pages of `page_size` places numbered from the root. Every request sleeps `delay` first.
+    """
+    def do_GET(self):
+        srv = self.server; time.sleep(srv.delay)
+        host, _, rest = self.path.lstrip("/").partition("/"); rest = "/" + rest
+        with srv.lock:
+            srv.hits[host] += 1
+        if m := re.search(r"places/(\d+)/universe", rest):
+            body = {"universeId": srv.universe_of(int(m.group(1)))}
+        elif host == "games.roblox.com":
+            u = int(rest.rsplit("=", 1)[1]); body = {"data": [{"rootPlaceId": u // 10 * 1000}]}
+        elif m := re.search(r"universes/(\d+)/places", rest):
+            u = int(m.group(1)); c = int(rest.split("cursor=")[1]) if "cursor=" in rest else 0; n = srv.page_size
+            body = {"data": [{"id": u // 10 * 1000 + c * n + i, "name": f"Place {i}"} for i in range(n)],
+                    "nextPageCursor": str(c + 1) if c + 1 < srv.pages else None}
+        elif host == "economy.roblox.com":
+            body = {"Created": "2020-01-01T00:00:00Z", "Updated": "2021-01-01T00:00:00Z"}
+        else:
+            body = {"data": []}
+        data = json.dumps(body).encode()
+        self.send_response(200); self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data))); self.end_headers(); self.wfile.write(data)
+    do_POST = do_GET
+
+    def log_message(self, *a):
+        pass
+
+
+class ToLocal(requests.adapters.BaseAdapter):
+    """Sends https://<host>/<path> to http://127.0.0.1:<port>/<host>/<path> through the shared pool."""
+    def __init__(self, base):
+        super().__init__(); self.base = base
+
+    def send(self, request, **kw):
+        u = urlsplit(request.url)
+        request.url = f"{self.base}/{u.netloc}{u.path}" + (f"?{u.query}" if u.query else "")
+        return hopr_core.HTTP.adapter.send(request, **kw)
+
+    def close(self):
+        pass
+
+
+def serve(delay=0.15, pages=6, page_size=5, universe_of=lambda pid: pid * 10):
+    """Starts a SlowRoblox server on a free port; `srv.base` is its URL, `srv.hits` counts requests per host."""
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), SlowRoblox); srv.daemon_threads = True
+    srv.delay = delay; srv.pages = pages; srv.page_size = page_size; srv.universe_of = universe_of
+    srv.lock = threading.Lock(); srv.hits = Counter(); srv.base = f"http://127.0.0.1:{srv.server_port}"
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import hopr_core
+
+BUNDLE = ("-----BEGIN CERTIFICATE-----\n" + "A" * 64 + "\n-----END CERTIFICATE-----\n") * 200
+MITM = "-----BEGIN CERTIFICATE-----\nMITMCA\n-----END CERTIFICATE-----\n"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Three bootstrapper roots with 20 client folders each (plus a non-client folder) and a CA file."""
+    roots = {k: tmp_path / k for k in ("Roblox", "Bloxstrap", "Fishstrap")}
+    for root in roots.values():
+        for i in range(20):
+            v = root / "Versions" / f"version-{i:04x}"; (v / "ssl").mkdir(parents=True)
+            (v / "RobloxPlayerBeta.exe").write_bytes(b"x"); (v / "ssl" / "cacert.pem").write_text(BUNDLE)
+        (root / "Versions" / "version-studio").mkdir()
+    ca = tmp_path / "ca.pem"; ca.write_text(MITM)
+    return roots, ca
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Counts cacert.pem reads and Versions listings done through pathlib."""
+    counts = {"reads": 0, "listings": 0}
+    read_text, iterdir = Path.read_text, Path.iterdir
+    def counting_read(self, *a, **kw):
+        counts["reads"] += self.name == "cacert.pem"
+        return read_text(self, *a, **kw)
+    def counting_iterdir(self):
+        counts["listings"] += self.name == "Versions"
+        return iterdir(self)
+    monkeypatch.setattr(Path, "read_text", counting_read); monkeypatch.setattr(Path, "iterdir", counting_iterdir)
+    return counts
+
+
+def engine(tmp_path, roots):
+    eng = hopr_core.HoprEngine(tmp_path / "data"); eng.client_roots = roots
+    return eng
+
+
+def test_warm_join_skips_the_scan(tmp_path, tree, scans):
+    roots, ca = tree
+    engine(tmp_path, roots)._install_ca(ca)
+    assert scans == {"reads": 60, "listings": 3}
+    assert all(MITM in (v / "ssl" / "cacert.pem").read_text() for r in roots.values() for v in (r / "Versions").glob("version-0*"))
+    scans.update(reads=0, listings=0)
+    engine(tmp_path, roots)._install_ca(ca)  # fresh engine: index comes from disk
+    assert scans == {"reads": 0, "listings": 0}
+
+
+def test_new_folder_is_the_only_one_read(tmp_path, tree, scans):
+    roots, ca = tree
+    eng = engine(tmp_path, roots); eng._install_ca(ca)
+    v = roots["Bloxstrap"] / "Versions" / "version-new"; (v / "ssl").mkdir(parents=True)
+    (v / "RobloxPlayerBeta.exe").write_bytes(b"x"); (v / "ssl" / "cacert.pem").write_text(BUNDLE)
+    scans.update(reads=0, listings=0)
+    eng._install_ca(ca)
+    assert scans == {"reads": 1, "listings": 1}
+    assert MITM in (v / "ssl" / "cacert.pem").read_text()
+
+
+def test_bundle_re_extracted_in_place_is_reinstalled(tmp_path, tree, scans):
+    roots, ca = tree
+    eng = engine(tmp_path, roots); eng._install_ca(ca)
+    v = roots["Fishstrap"] / "Versions" / "version-0007"; versions = v.parent
+    before = v.stat(), versions.stat()
+    (v / "ssl" / "cacert.pem").write_text(BUNDLE)  # bootstrapper restores the stock bundle
+    os.utime(v, ns=(before[0].st_atime_ns, before[0].st_mtime_ns))
+    os.utime(versions, ns=(before[1].st_atime_ns, before[1].st_mtime_ns))
+    scans.update(reads=0, listings=0)
+    engine(tmp_path, roots)._install_ca(ca)
+    assert scans == {"reads": 1, "listings": 1}
+    assert MITM in (v / "ssl" / "cacert.pem").read_text()
+
+
+def test_new_ca_invalidates_every_folder(tmp_path, tree, scans):
+    roots, ca = tree
+    engine(tmp_path, roots)._install_ca(ca)
+    ca.write_text(MITM.replace("MITMCA", "OTHERCA"))
+    scans.update(reads=0, listings=0)
+    engine(tmp_path, roots)._install_ca(ca)
+    assert scans == {"reads": 60, "listings": 3}
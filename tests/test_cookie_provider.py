@@ -0,0 +1,72 @@
+import base64, json, os
+
+import pytest
+
+import hopr_core
+
+
+class FakeDpapi:
+    """Stands in for CryptUnprotectData: the "encryption" is a byte reversal; counts calls."""
+    def __init__(self):
+        self.calls = 0
+
+    @staticmethod
+    def protect(text):
+        return base64.b64encode(text.encode()[::-1]).decode()
+
+    def __call__(self, blob):
+        self.calls += 1; return blob[::-1]
+
+
+@pytest.fixture
+def cookie_file(tmp_path):
+    path = tmp_path / "RobloxCookies.dat"
+    def write(value, mtime_ns=None):
+        text = f"domain\t.roblox.com\t.ROBLOSECURITY\t{value};" if value else "domain\t.roblox.com\tRBXEventTrackerV2\tx;"
+        path.write_text(json.dumps({"CookiesVersion": "1", "CookiesData": FakeDpapi.protect(text)}), encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path, write
+
+
+def test_decrypts_once_per_file_version(cookie_file):
+    path, write = cookie_file; write("abc")
+    dpapi = FakeDpapi(); cp = hopr_core.CookieProvider(path, decrypt=dpapi)
+    assert [cp.get() for _ in range(50)] == ["abc"] * 50
+    assert dpapi.calls == 1 and cp.loads == 1
+
+
+def test_reloads_when_the_size_changes(cookie_file):
+    path, write = cookie_file; write("abc", mtime_ns=10**18)
+    dpapi = FakeDpapi(); cp = hopr_core.CookieProvider(path, decrypt=dpapi)
+    assert cp.get() == "abc"
+    write("abcdef", mtime_ns=10**18)  # same mtime, longer file
+    assert cp.get() == "abcdef" and dpapi.calls == 2
+
+
+def test_reloads_when_only_the_mtime_changes(cookie_file):
+    path, write = cookie_file; write("abc", mtime_ns=10**18)
+    dpapi = FakeDpapi(); cp = hopr_core.CookieProvider(path, decrypt=dpapi)
+    assert cp.get() == "abc"
+    write("xyz", mtime_ns=10**18 + 1)  # same size, rewritten
+    assert cp.get() == "xyz" and dpapi.calls == 2
+
+
+def test_invalidate_forces_a_reload(cookie_file):
+    path, write = cookie_file; write("abc")
+    dpapi = FakeDpapi(); cp = hopr_core.CookieProvider(path, decrypt=dpapi)
+    cp.get(); cp.invalidate()
+    assert cp.get() == "abc" and dpapi.calls == 2 and cp.loads == 2
+
+
+def test_missing_file_and_missing_cookie(cookie_file):
+    path, write = cookie_file
+    dpapi = FakeDpapi(); cp = hopr_core.CookieProvider(path, decrypt=dpapi)
+    assert cp.get() is None and cp.get() is None
+    assert dpapi.calls == 0 and cp.loads == 1  # "no file" is cached too
+    write(None)  # file appears without a .ROBLOSECURITY entry
+    assert cp.get() is None and cp.get() is None and dpapi.calls == 1
+    write("abc", mtime_ns=10**18)
+    assert cp.get() == "abc"
+    path.unlink()
+    assert cp.get() is None and dpapi.calls == 2
@@ -0,0 +1,68 @@
+import time
+
+import hopr_core
+
+
+class FlakyEngine:
+    """Just enough of HoprEngine for Prefetcher; resolve_universe fails `failures` times first."""
+    def __init__(self, cache, failures=0):
+        self.search_cache = cache; self.failures = failures; self.resolves = 0; self.listings = 0
+
+    def resolve_universe(self, place_id):
+        self.resolves += 1
+        if self.resolves <= self.failures:
+            raise ConnectionError("transient")
+        return int(place_id) * 10
+
+    def fetch_root_place(self, universe_id, place_id):
+        return universe_id * 100
+
+    def iter_place_pages(self, universe_id, root, cancel=None, on_request=None):
+        self.listings += 1; on_request()
+        yield [{"id": root + i} for i in range(3)]
+
+
+def wait_for(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end and not cond():
+        time.sleep(0.01)
+    return cond()
+
+
+def prefetcher(engine, **kw):
+    return hopr_core.Prefetcher(engine, budget=3600, idle_after=0, **{"retry_base": 0.1, "retry_max": 0.4, **kw})
+
+
+def test_failed_step_is_retried_with_backoff(tmp_path):
+    engine = FlakyEngine(hopr_core.SearchCache(tmp_path / "c.json", delay=60), failures=2)
+    pf = prefetcher(engine); t0 = time.monotonic()
+    try:
+        pf.set_targets(["7"])
+        assert wait_for(lambda: engine.search_cache.listing(70) is not None)
+        assert engine.resolves == 3 and time.monotonic() - t0 >= 0.1 + 0.2 - 0.05  # 0.1 s, then 0.2 s
+        assert ("listing", "7") not in pf._failed and ("icons", "7") in pf._done
+    finally:
+        pf.stop()
+
+
+def test_finished_steps_expire_with_the_cache_ttl(tmp_path):
+    engine = FlakyEngine(hopr_core.SearchCache(tmp_path / "c.json", ttl=0.3, delay=60))
+    pf = prefetcher(engine)
+    try:
+        pf.set_targets(["7"])
+        assert wait_for(lambda: engine.listings == 1)
+        time.sleep(0.1); assert engine.listings == 1  # still fresh: nothing re-run
+        assert wait_for(lambda: engine.listings == 2)  # stale: listed again
+    finally:
+        pf.stop()
+
+
+def test_ttl_zero_does_not_loop(tmp_path):
+    engine = FlakyEngine(hopr_core.SearchCache(tmp_path / "c.json", ttl=0, delay=60))
+    pf = prefetcher(engine)
+    try:
+        pf.set_targets(["7"])
+        assert wait_for(lambda: engine.listings == 1)
+        time.sleep(0.3); assert engine.listings == 1
+    finally:
+        pf.stop()
@@ -0,0 +1,47 @@
+import asyncio, shutil, subprocess, sys
+
+import pytest
+
+import hopr_core
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux") or hopr_core.optional("psutil") is None,
+                                reason="dummy client processes need Linux and psutil")
+
+
+@pytest.fixture
+def dummies(tmp_path):
+    """Copies of sleep named like the client and its crash handler; spawn(name, seconds) runs one."""
+    sleep = shutil.which("sleep")
+    if sleep is None:
+        pytest.skip("no sleep binary")
+    exes = {}
+    for name in ("RobloxPlayerBeta.exe", "RobloxCrashHandler.exe"):
+        exes[name] = tmp_path / name; shutil.copy(sleep, exes[name])
+    procs = []
+    def spawn(name, seconds):
+        procs.append(subprocess.Popen([str(exes[name]), str(seconds)])); return procs[-1]
+    yield spawn
+    for p in procs:
+        p.kill(); p.wait()
+
+
+def test_watcher_reports_start_crash_handler_and_exit(dummies):
+    async def scenario():
+        w = hopr_core.ProcessWatcher(interval=0.05).start()
+        try:
+            await asyncio.sleep(0.2)
+            assert not w.started.is_set()
+            client = dummies("RobloxPlayerBeta.exe", 1.5)
+            assert await w.wait(w.started, timeout=3)
+            assert w.pids == [client.pid] and not w.exited.is_set()
+            dummies("RobloxCrashHandler.exe", 0.5)
+            assert await w.wait(w.crash_handler_seen, timeout=3)
+            assert await w.wait(w.exited, timeout=5)
+            assert not w.started.is_set() and w.pids == []
+            return w.scans, w.lookups
+        finally:
+            await w.stop()
+    scans, lookups = asyncio.run(scenario())
+    # One walk at start, one when the last client PID went away; everything else is a PID diff
+    assert scans == 2
+    assert 2 <= lookups < 50
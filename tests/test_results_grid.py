@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtWidgets import QFrame, QScrollArea
+
+import Hopr
+
+
+@pytest.fixture
+def grid(qapp, pump):
+    scroll = QScrollArea(); scroll.setWidgetResizable(True); scroll.setFrameShape(QFrame.NoFrame)
+    g = Hopr.ResultsGrid(scroll, lambda p: Hopr.PlaceCard(p, on_join=lambda *_: None, on_open=lambda *_: None))
+    scroll.setWidget(g); scroll.resize(700, 240); scroll.show()
+    g.set_places([{"id": i, "name": f"P{i}"} for i in range(1, 2001)])
+    pump(0.2)
+    yield g
+    scroll.close()
+
+
+def test_only_rows_near_viewport_are_live(grid):
+    assert 0 < len(grid.cards()) < 40
+    assert all(c.geometry().top() < grid._scroll.viewport().height() + 2 * grid.row_height() for c in grid.cards())
+
+
+def test_taller_viewport_binds_newly_visible_rows(grid, pump):
+    before = len(grid.cards())
+    grid._scroll.resize(700, 1040)  # grid is already taller than this, so only the viewport resizes
+    pump(0.2)
+    bottom = max(c.geometry().bottom() for c in grid.cards())
+    assert len(grid.cards()) > before
+    assert bottom >= grid._scroll.viewport().height()
+
+
+def test_scrolling_rebinds_cards(grid, pump):
+    grid.card_for(1).join_btn.setFocus()  # a focused card scrolling out must not pull the view back
+    bar = grid._scroll.verticalScrollBar(); target = bar.maximum() // 2; bar.setValue(target)
+    pump(0.1)
+    ids = [c.place["id"] for c in grid.cards()]
+    assert bar.value() == target
+    assert min(ids) > 500 and grid.card_for(ids[0]) is not None
+
+
+def test_sections_get_a_header_row_and_their_own_card_rows(grid, pump):
+    grid._scroll.resize(700, 4000); grid.set_places([])
+    for u in range(3):  # 5, 6, 7 places: every section ends on a partial row
+        grid.append_section(f"Universe {u}", [{"id": u * 100 + i + 1, "name": "x"} for i in range(5 + u)])
+    pump(0.2)
+    headers = [h for _, h in grid._sections]
+    assert [h.text() for h in headers] == ["Universe 0", "Universe 1", "Universe 2"] and all(h.isVisible() for h in headers)
+    for k, (start, end, _) in enumerate(grid._layout):
+        cards = [grid.card_for(p["id"]) for p in grid.places[start:end]]
+        assert all(c is not None for c in cards)
+        assert min(c.geometry().top() for c in cards) > headers[k].geometry().bottom()
+        if k + 1 < len(headers):
+            assert max(c.geometry().bottom() for c in cards) < headers[k + 1].geometry().top()
+        assert cards[0].geometry().left() == grid.MARGIN  # each section starts a fresh row
+    grid.remove_places([101, 102])
+    assert [start for start, _ in grid._sections] == [0, 5, 9]
+    grid.set_places([{"id": 1}]); pump(0.1)
+    assert grid._sections == [] and not any(h.isVisible() for h in headers)
@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import hopr_core
+
+
+def encoded(mode, fmt="PNG"):
+    base = Image.radial_gradient("L").resize((512, 512))
+    im = {"P": lambda: base.convert("RGB").quantize(64), "1": lambda: base.convert("1"),
+          "I;16": lambda: Image.new("I;16", (512, 512), 3000), "CMYK": lambda: base.convert("CMYK")}.get(mode, lambda: base.convert(mode))()
+    b = io.BytesIO(); im.save(b, format=fmt); return b.getvalue()
+
+
+@pytest.mark.parametrize("mode, fmt", [("RGB", "PNG"), ("RGBA", "PNG"), ("L", "PNG"), ("LA", "PNG"), ("P", "PNG"),
+                                       ("1", "PNG"), ("I;16", "PNG"), ("RGB", "JPEG"), ("CMYK", "JPEG")])
+def test_every_icon_mode_becomes_a_rounded_rgba_thumb(mode, fmt):
+    img = hopr_core._round_thumb(encoded(mode, fmt))
+    assert img.mode == "RGBA" and img.size == (hopr_core.THUMB_PX, hopr_core.THUMB_PX)
+    assert img.getpixel((0, 0))[3] == 0 and img.getpixel((img.width // 2, img.height // 2))[3] == 255
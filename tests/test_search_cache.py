@@ -0,0 +1,48 @@
+import json, time
+
+import hopr_core
+
+
+def places(u, n=3):
+    return [{"id": u * 1000 + i, "updated": None} for i in range(n)]
+
+
+def test_writes_are_debounced_and_flush_persists(tmp_path):
+    cache = hopr_core.SearchCache(tmp_path / "c.json", delay=0.2)
+    for i in range(40):
+        cache.store_universe(i, 7)
+    assert cache.writes == 0
+    time.sleep(0.6)
+    assert cache.writes == 1
+    assert json.loads((tmp_path / "c.json").read_text())["universe_of"]["39"] == 7
+    cache.store_universe(99, 8); cache.flush()
+    assert hopr_core.SearchCache(tmp_path / "c.json").universe_for(99) == 8
+
+
+def test_touch_persists_in_place_timestamp_updates(tmp_path):
+    cache = hopr_core.SearchCache(tmp_path / "c.json", delay=60)
+    ps = places(1); cache.store_listing(1, 1000, ps); cache.flush()
+    ps[0]["updated"] = "2024-01-01T00:00:00Z"
+    cache.flush()  # nothing marked dirty yet
+    assert json.loads((tmp_path / "c.json").read_text())["listings"]["1"]["places"][0]["updated"] is None
+    cache.touch(); cache.flush()
+    assert json.loads((tmp_path / "c.json").read_text())["listings"]["1"]["places"][0]["updated"] == "2024-01-01T00:00:00Z"
+
+
+def test_least_recently_used_listings_are_evicted_with_their_mappings(tmp_path):
+    cache = hopr_core.SearchCache(tmp_path / "c.json", max_listings=2, delay=60)
+    for u in (1, 2):
+        cache.store_listing(u, u * 1000, places(u)); time.sleep(0.01)
+    cache.store_universe(555, 1)  # a searched place id that is not a subplace
+    cache.listing(1)              # 1 is now more recently used than 2
+    cache.store_listing(3, 3000, places(3))
+    assert cache.listing(2) is None and cache.listing(1) is not None and cache.listing(3) is not None
+    assert cache.universe_for(2000) is None and cache.universe_for(1000) == 1 and cache.universe_for(555) == 1
+
+
+def test_old_listings_are_dropped_on_load(tmp_path):
+    cache = hopr_core.SearchCache(tmp_path / "c.json", delay=60)
+    cache.store_listing(1, 1000, places(1)); cache.store_listing(2, 2000, places(2))
+    cache._listings["1"]["used"] = time.time() - 30 * 86400; cache.touch(); cache.flush()
+    again = hopr_core.SearchCache(tmp_path / "c.json", max_age=14 * 86400)
+    assert again.listing(1) is None and again.listing(2) is not None
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+import hopr_core
+from mock_roblox import ToLocal, serve
+
+DELAY = 0.15
+
+
+@pytest.fixture
+def server(monkeypatch):
+    srv = serve(DELAY)  # place N: universe N*10, places N*1000 + 0..29 in six pages of five
+    monkeypatch.setitem(hopr_core.HTTP.session.adapters, "https://", ToLocal(srv.base))
+    yield srv
+    srv.shutdown(); srv.server_close()
+
+
+def test_rapid_searches_render_only_the_latest(qapp, pump, server):
+    import Hopr
+    w = Hopr.Window(); w.show()
+    rendered, stamped = set(), set()
+    page, stamps = w._on_results_page, w._update_existing_cards_with_timestamps
+    w._on_results_page = lambda pl, n, total: (rendered.update(p["id"] // 1000 for p in pl), page(pl, n, total))
+    w._update_existing_cards_with_timestamps = lambda pl: (stamped.update(p["id"] // 1000 for p in pl), stamps(pl))
+    before = set(threading.enumerate())
+    try:
+        for pid in (41, 42, 43, 44, 45):  # each one lands while the previous is mid-request
+            w.search.setText(str(pid)); w.on_search_clicked(); pump(0.2)
+        # Superseded searches stop after their in-flight request instead of paginating on
+        assert pump(4 * DELAY, lambda: not w._jobs.alive())
+        assert pump(10, lambda: w.status.text().startswith("Found"))
+        assert pump(5, lambda: all(p.get("updated") for p in w.results.places))
+        assert {p["id"] // 1000 for p in w.results.places} == {45} and len(w.results.places) == 30
+        assert rendered == {45} and stamped == {45}
+        orphans = [t.name for t in threading.enumerate()
+                   if t not in before and t.is_alive() and t.name.startswith(("search", "timestamps"))]
+        assert orphans == []
+    finally:
+        w._jobs.cancel(); w.close()
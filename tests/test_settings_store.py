@@ -0,0 +1,31 @@
+import json, threading, time
+
+import hopr_core
+
+
+def test_burst_of_saves_is_one_write(tmp_path):
+    store = hopr_core.SettingsStore(tmp_path / "settings.json", delay=0.1)
+    for i in range(50):
+        store.save({"n": i})
+    time.sleep(0.4)
+    assert store.writes == 1 and json.loads((tmp_path / "settings.json").read_text())["n"] == 49
+
+
+def test_flush_waits_for_the_write_in_flight(tmp_path, monkeypatch):
+    store = hopr_core.SettingsStore(tmp_path / "settings.json", delay=0)
+    taken = threading.Event(); write_file = store._write_file
+    def slow_write(data):
+        taken.set(); time.sleep(0.3); write_file(data)
+    monkeypatch.setattr(store, "_write_file", slow_write)
+    store.save({"theme": "dark"})
+    assert taken.wait(2)  # the writer thread holds the snapshot; nothing is pending any more
+    store.flush()
+    assert json.loads((tmp_path / "settings.json").read_text()) == {"theme": "dark"}
+
+
+def test_flush_writes_pending_snapshot_once(tmp_path):
+    store = hopr_core.SettingsStore(tmp_path / "settings.json", delay=60)
+    store.save({"a": 1}); store.save({"a": 2})
+    assert store.flush() is True and store.writes == 1
+    assert json.loads((tmp_path / "settings.json").read_text()) == {"a": 2}
+    assert store.flush() is True and store.writes == 1
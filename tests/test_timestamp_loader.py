@@ -0,0 +1,71 @@
+import json, threading, time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import hopr_core
+
+RETRY_AFTER = 0.1
+ALWAYS_429 = 13
+
+
+class Throttled(BaseHTTPRequestHandler):
+    """Fake economy API: /assets/<pid>. Every third place is throttled once, ALWAYS_429 forever."""
+    def do_GET(self):
+        srv = self.server; pid = int(self.path.rsplit("/", 1)[1])
+        with srv.lock:
+            srv.hits[pid].append(time.monotonic()); n = len(srv.hits[pid])
+        time.sleep(srv.delay)
+        if pid == ALWAYS_429 or (pid % 3 == 0 and n == 1):
+            self.send_response(429); self.send_header("Retry-After", str(RETRY_AFTER))
+            self.send_header("Content-Length", "0"); self.end_headers(); return
+        data = json.dumps({"Created": f"2020-01-01T00:00:{pid % 60:02d}Z", "Updated": "2021-01-01T00:00:00Z"}).encode()
+        self.send_response(200); self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data))); self.end_headers(); self.wfile.write(data)
+
+    def log_message(self, *a):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Throttled); srv.daemon_threads = True
+    srv.lock = threading.Lock(); srv.hits = defaultdict(list); srv.delay = 0.0
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.url = f"http://127.0.0.1:{srv.server_port}/assets/{{pid}}"
+    yield srv
+    srv.shutdown(); srv.server_close()
+
+
+def loader(server, batches, **kw):
+    kw = {"workers": 4, "rate": 200.0, "burst": 20, "max_retries": 3, "base_delay": 0.01, "batch_size": 5, **kw}
+    return hopr_core.TimestampLoader(on_batch=batches.append, url_template=server.url, session=requests.Session(), **kw)
+
+
+def test_throttled_places_are_retried_until_filled(server):
+    batches = []; places = [{"id": i} for i in range(1, 31) if i != ALWAYS_429]
+    ld = loader(server, batches); ld.submit(places); ld.close(wait=True)
+    assert all(p["updated"] == "2021-01-01T00:00:00Z" for p in places)
+    assert sorted(p["id"] for b in batches for p in b) == [p["id"] for p in places]
+    throttled = sorted(pid for pid, hits in server.hits.items() if len(hits) > 1)
+    assert throttled == [pid for pid in sorted(server.hits) if pid % 3 == 0]
+    # the second attempt waited out Retry-After
+    assert all(server.hits[pid][1] - server.hits[pid][0] >= RETRY_AFTER * 0.9 for pid in throttled)
+
+
+def test_retry_cap_for_a_place_that_is_always_throttled(server):
+    batches = []; place = {"id": ALWAYS_429}
+    ld = loader(server, batches, max_retries=3); ld.submit([place]); ld.close(wait=True)
+    assert len(server.hits[ALWAYS_429]) == 4  # first try + max_retries
+    assert "updated" not in place and batches == [[place]]  # still reported, so the caller isn't left waiting
+
+
+def test_cancel_suppresses_on_batch(server):
+    server.delay = 0.3; batches = []; places = [{"id": i} for i in range(1, 21)]
+    ld = loader(server, batches, batch_size=1); ld.submit(places)
+    time.sleep(0.1); ld.cancel()
+    time.sleep(0.6)  # in-flight requests complete after the cancel
+    assert batches == []
+    assert len([pid for pid in server.hits]) <= 4  # queued places were dropped, not fetched
@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+import Hopr
+
+
+class _Resp:
+    def __init__(self, data): self._d = data; self.status_code = 200; self.headers = {}
+    def json(self): return self._d
+    def raise_for_status(self): pass
+
+
+def _listing_get(self, url, timeout=10):
+    if "games?universeIds" in url:
+        return _Resp({"data": [{"rootPlaceId": 1}]})
+    return _Resp({"data": [{"id": i, "name": f"P{i}"} for i in (1, 2, 3)], "nextPageCursor": None})
+
+
+@pytest.mark.parametrize("age, expected", [(0, set()), (7200, {1, 2, 3})])
+def test_stale_listing_rereads_known_timestamps(qapp, pump, monkeypatch, age, expected):
+    submitted = []
+    monkeypatch.setattr(Hopr.HoprEngine, "get", _listing_get)
+    monkeypatch.setattr(Hopr.TimestampLoader, "submit", lambda self, ps: submitted.extend(p["id"] for p in ps))
+    monkeypatch.setattr(Hopr.ThumbnailPipeline, "request", lambda self, ids: None)
+    w = Hopr.Window()
+    cache = w._search_cache
+    cache.store_universe("1", 10)
+    cache.store_listing(10, 1, [{"id": i, "name": f"P{i}", "updated": "2020-01-01T00:00:00Z"} for i in (1, 2, 3)])
+    cache._listings["10"]["fetched"] = time.time() - age
+    w.search.setText("1"); w.on_search_clicked()
+    assert pump(3, lambda: w.search_btn.text() == "Search")
+    assert set(submitted) == expected
+    w.close()